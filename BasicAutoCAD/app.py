@@ -4,7 +4,7 @@ Flask API for AutoDraw AI Agent
 Provides REST endpoints for AutoCAD drawing automation
 """
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file, stream_with_context
 from flask_cors import CORS
 import json
 import os
@@ -257,6 +257,50 @@ def batch_process():
             "timestamp": datetime.now().isoformat()
         }), 500
 
+@app.route('/api/v1/batch/stream', methods=['POST'])
+def batch_process_stream():
+    """Process multiple drawing requests, streaming one NDJSON line per result"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "No JSON data provided"}), 400
+        
+        # Validate required fields
+        if 'requests' not in data:
+            return jsonify({"error": "Missing 'requests' field"}), 400
+        
+        requests_list = data['requests']
+        if not isinstance(requests_list, list):
+            return jsonify({"error": "'requests' must be a list"}), 400
+        
+        # Get agent
+        agent = get_agent()
+        
+        def generate():
+            # The 200 headers are already sent, so a failure becomes error
+            # lines instead of cutting the stream off
+            written = 0
+            try:
+                for result in agent.batch_process_requests_iter(requests_list):
+                    yield json.dumps(result) + '\n'
+                    written += 1
+            except Exception as e:
+                logger.error(f"Error in batch stream processing: {e}")
+                logger.error(traceback.format_exc())
+                for _ in range(written, len(requests_list)):
+                    yield json.dumps({"success": False, "error": str(e)}) + '\n'
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+            
+    except Exception as e:
+        logger.error(f"Error in batch stream processing: {e}")
+        logger.error(traceback.format_exc())
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "timestamp": datetime.now().isoformat()
+        }), 500
+
 @app.route('/api/v1/commands', methods=['GET'])
 def get_available_commands():
     """Get available AutoCAD commands"""
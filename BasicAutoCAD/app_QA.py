@@ -4,111 +4,271 @@ Flask API for AutoDraw AI Agent
 Provides REST endpoints for AutoCAD drawing automation
 """
 
-from flask import Flask, request, jsonify, send_file
-from flask_cors import CORS
+from flask import Flask, Response, request, jsonify, send_file
+from flask.json.provider import DefaultJSONProvider
+import functools
 import json
+import hashlib
 import os
 import logging
 import tempfile
+import threading
+import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
-import traceback
+from typing import Any, Dict, List, Optional, Union
+
+import fastjsonschema
+import msgspec
+import orjson
 
 from autodraw_ai_agent_QA import AutoDrawAIAgent
 import config
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Configure logging; defaults to WARNING, set LOG_LEVEL=INFO for per-request logs
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'WARNING').upper(), format='%(asctime)s - %(levelname)s - %(message)s', force=True)
 logger = logging.getLogger(__name__)
 
+# JSON Schema for drawing specifications, compiled once at import
+LIGHTING_COMMANDS = [
+    config.LIGHTING_SYSTEMS[system]["command"] for system in config.LIGHTING_SYSTEMS
+]
+
+SPEC_SCHEMA = {
+    "type": "object",
+    "required": ["command"],
+    "properties": {
+        "command": {"enum": list(config.COMMAND_MAP)},
+        "lighting_system": {"enum": list(config.LIGHTING_SYSTEMS)},
+        "specifications": {
+            "type": "object",
+            "properties": {
+                "mounting_type": {"enum": config.MOUNTING_OPTIONS + [None]},
+                "lens_type": {"enum": config.LENS_OPTIONS + [None]},
+                "color_temperature": {"enum": config.COLOR_TEMPERATURES + [None]}
+            }
+        }
+    },
+    # Lighting system is only required for lighting-related commands
+    "if": {"properties": {"command": {"enum": LIGHTING_COMMANDS}}},
+    "then": {"required": ["lighting_system"]}
+}
+
+_VALIDATE = fastjsonschema.compile(SPEC_SCHEMA)
+
+# Configuration is static at runtime, so serialize the /api/v1/config body once
+_CONFIG_BYTES = orjson.dumps({
+    "success": True,
+    "configuration": {
+        "openai_model": config.OPENAI_MODEL,
+        "openai_temperature": config.OPENAI_TEMPERATURE,
+        "openai_max_tokens": config.OPENAI_MAX_TOKENS,
+        "autocad_timeout": config.AUTOCAD_TIMEOUT,
+        "autocad_command_delay": config.AUTOCAD_COMMAND_DELAY,
+        "default_units": config.DEFAULT_UNITS,
+        "command_map": config.COMMAND_MAP,
+        "lighting_systems": config.LIGHTING_SYSTEMS,
+        "color_temperatures": config.COLOR_TEMPERATURES,
+        "lens_options": config.LENS_OPTIONS,
+        "mounting_options": config.MOUNTING_OPTIONS
+    }
+})
+_CONFIG_ETAG = hashlib.md5(_CONFIG_BYTES).hexdigest()
+
+# Request bodies, decoded and type-checked by msgspec in one pass
+class FixtureReq(msgspec.Struct):
+    fixture_type: str
+    specifications: Union[dict, str]  # the QA agent also takes a JSON string
+
+class DrawReq(msgspec.Struct):
+    specifications: Any
+
+class NaturalReq(msgspec.Struct):
+    text: str
+
+class BatchReq(msgspec.Struct):
+    requests: List[str]
+
+class ExportReq(msgspec.Struct):
+    specifications: Any
+    format: str = 'dwg'
+
+_FIXTURE_DEC = msgspec.json.Decoder(FixtureReq)
+_DRAW_DEC = msgspec.json.Decoder(DrawReq)
+_NATURAL_DEC = msgspec.json.Decoder(NaturalReq)
+_BATCH_DEC = msgspec.json.Decoder(BatchReq)
+_EXPORT_DEC = msgspec.json.Decoder(ExportReq)
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(
+            obj,
+            default=self.default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
+app.json = OrjsonProvider(app)
+
+# Static CORS headers for all routes
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET,POST,OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type'
+}
+
+@app.after_request
+def _add_cors_headers(response):
+    response.headers.update(CORS_HEADERS)
+    return response
+
+@app.before_request
+def _cors_preflight():
+    """Answer CORS preflight requests for known routes; unknown paths still 404"""
+    if request.method == 'OPTIONS' and request.url_rule is not None:
+        return '', 204
+
+def _now() -> str:
+    """Current time as an ISO 8601 string for response timestamps"""
+    return datetime.now().isoformat()
+
+def _ok(timestamp: Optional[str] = None, **fields) -> Dict:
+    """Build a success response body"""
+    return {"success": True, **fields, "timestamp": timestamp or _now()}
+
+def _err(error: str, timestamp: Optional[str] = None, **fields) -> Dict:
+    """Build an error response body"""
+    return {"success": False, "error": error, **fields, "timestamp": timestamp or _now()}
+
+def _decode_body(decoder: msgspec.json.Decoder):
+    """Decode the request body, returning (request, None) or (None, error response)"""
+    raw = request.get_data()
+    if not raw:
+        return None, (jsonify({"error": "No JSON data provided"}), 400)
+    try:
+        return decoder.decode(raw), None
+    except msgspec.DecodeError as e:
+        return None, (jsonify({"error": str(e)}), 400)
+
+# Per-thread AutoCAD COM proxy (COM objects are bound to their apartment)
+_AC_LOCAL = threading.local()
 
-# Global agent instance
-agent = None
+# Cached result of the last AutoCAD connection check
+_AC_CACHE = {'ts': float('-inf'), 'ok': False}
+_AC_TTL = 5.0  # seconds
 
+# Maximum concurrent natural language parses for /api/v1/batch
+BATCH_MAX_WORKERS = 16
+
+# The agent reads the key once at startup, so snapshot it for status checks too
+_OPENAI_OK = bool(os.getenv('OPENAI_API_KEY'))
+
+# lru_cache can run get_agent on several threads at once before the first
+# result is cached, so the agent itself is built under a lock
+_AGENT_LOCK = threading.Lock()
+_agent: Optional[AutoDrawAIAgent] = None
+
+@functools.lru_cache(maxsize=1)
 def get_agent() -> AutoDrawAIAgent:
     """Get or create the AutoDraw AI Agent instance"""
-    global agent
-    if agent is None:
-        try:
-            agent = AutoDrawAIAgent()
-            logger.info("AutoDraw AI Agent initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize AutoDraw AI Agent: {e}")
-            raise
-    return agent
+    global _agent
+    if _agent is None:
+        with _AGENT_LOCK:
+            if _agent is None:
+                try:
+                    _agent = AutoDrawAIAgent()
+                    logger.info("AutoDraw AI Agent initialized successfully")
+                except Exception as e:
+                    logger.error("Failed to initialize AutoDraw AI Agent: %s", e)
+                    raise
+    return _agent
 
 def validate_autocad_connection():
-    """Validate AutoCAD connection"""
-    try:
-        import win32com.client
-        import pythoncom
-        
+    """Validate AutoCAD connection, reusing the last result for _AC_TTL seconds"""
+    now = time.monotonic()
+    if now - _AC_CACHE['ts'] < _AC_TTL:
+        return _AC_CACHE['ok']
+    
+    ok = _check_autocad_connection()
+    _AC_CACHE['ts'] = now
+    _AC_CACHE['ok'] = ok
+    return ok
+
+def get_autocad():
+    """Get this thread's cached AutoCAD COM proxy, reconnecting if it went stale"""
+    import win32com.client
+    import pythoncom
+    
+    # COM is initialized once per thread and the proxy is kept for its lifetime
+    if not getattr(_AC_LOCAL, 'com_initialized', False):
         pythoncom.CoInitialize()
+        _AC_LOCAL.com_initialized = True
+    
+    autocad = getattr(_AC_LOCAL, 'autocad', None)
+    if autocad is not None:
         try:
-            autocad = win32com.client.GetActiveObject("AutoCAD.Application")
-            logger.info(f"AutoCAD connection verified: {autocad.Name}")
-            return True
-        except Exception as e:
-            logger.error(f"AutoCAD not accessible: {e}")
-            return False
-        finally:
-            pythoncom.CoUninitialize()
+            autocad.Name
+            return autocad
+        except Exception:
+            logger.info("Cached AutoCAD proxy is stale, reconnecting")
+    
+    _AC_LOCAL.autocad = None
+    _AC_LOCAL.autocad = win32com.client.GetActiveObject("AutoCAD.Application")
+    return _AC_LOCAL.autocad
+
+def _check_autocad_connection():
+    """Check the AutoCAD connection over COM"""
+    try:
+        autocad = get_autocad()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("AutoCAD connection verified: %s", autocad.Name)
+        return True
     except ImportError:
         logger.error("pywin32 not installed")
         return False
+    except Exception as e:
+        logger.error("AutoCAD not accessible: %s", e)
+        return False
 
 
 @app.route('/api/v1/fixture', methods=['POST'])
 def draw_fixture():
     """Draw any fixture type from specifications"""
     
-    from datetime import datetime
-    
     # Log every API call with timestamp
-    logger.info(f"=== API CALL RECEIVED at {datetime.now().isoformat()} ===")
+    timestamp = _now()
+    logger.info("=== API CALL RECEIVED at %s ===", timestamp)
     
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "No JSON data provided"}), 400
-        
-        # Validate required fields
-        if 'fixture_type' not in data:
-            return jsonify({"error": "Missing 'fixture_type' field"}), 400
-        if 'specifications' not in data:
-            return jsonify({"error": "Missing 'specifications' field"}), 400
+        req, error = _decode_body(_FIXTURE_DEC)
+        if error:
+            return error
         
-        fixture_type = data['fixture_type']
-        specs = data['specifications']
+        fixture_type = req.fixture_type
+        specs = req.specifications
         
         # Get agent and draw
         agent = get_agent()
         result = agent.draw_fixture(fixture_type, specs)
         
         if result.get("success"):
-            return jsonify({
-                "success": True,
-                "message": f"{fixture_type} fixture created successfully",
-                "result": result,
-                "timestamp": datetime.now().isoformat()
-            }), 200
+            return jsonify(_ok(
+                message=f"{fixture_type} fixture created successfully",
+                result=result,
+                timestamp=timestamp
+            )), 200
         else:
-            return jsonify({
-                "success": False,
-                "error": result.get("error", "Unknown error"),
-                "timestamp": datetime.now().isoformat()
-            }), 400
+            return jsonify(_err(result.get("error", "Unknown error"), timestamp=timestamp)), 400
             
     except Exception as e:
-        logger.error(f"Error drawing fixture: {e}")
-        return jsonify({
-            "success": False,
-            "error": str(e),
-            "timestamp": datetime.now().isoformat()
-        }), 500
+        logger.exception("Error drawing fixture: %s", e)
+        return jsonify(_err(str(e), timestamp=timestamp)), 500
 
 
 @app.route('/health', methods=['GET'])
@@ -119,38 +279,34 @@ def health_check():
         autocad_ok = validate_autocad_connection()
         
         # Check OpenAI API key
-        openai_ok = bool(os.getenv('OPENAI_API_KEY'))
+        openai_ok = _OPENAI_OK
         
         status = "healthy" if autocad_ok and openai_ok else "unhealthy"
         
         return jsonify({
             "status": status,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now(),
             "autocad_connection": autocad_ok,
             "openai_api_key": openai_ok,
             "version": "1.0.0"
         }), 200 if status == "healthy" else 503
     except Exception as e:
-        logger.error(f"Health check failed: {e}")
+        logger.exception("Health check failed: %s", e)
         return jsonify({
             "status": "error",
             "error": str(e),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now()
         }), 500
 
 @app.route('/api/v1/draw', methods=['POST'])
 def create_drawing():
     """Create a drawing from specifications"""
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "No JSON data provided"}), 400
-        
-        # Validate required fields
-        if 'specifications' not in data:
-            return jsonify({"error": "Missing 'specifications' field"}), 400
+        req, error = _decode_body(_DRAW_DEC)
+        if error:
+            return error
         
-        specs = data['specifications']
+        specs = req.specifications
         
         # Get agent
         agent = get_agent()
@@ -159,41 +315,23 @@ def create_drawing():
         result = agent.create_complete_drawing(specs)
         
         if result.get("success"):
-            return jsonify({
-                "success": True,
-                "message": "Drawing created successfully",
-                "result": result,
-                "timestamp": datetime.now().isoformat()
-            }), 200
+            return jsonify(_ok(message="Drawing created successfully", result=result)), 200
         else:
-            return jsonify({
-                "success": False,
-                "error": result.get("error", "Unknown error"),
-                "timestamp": datetime.now().isoformat()
-            }), 400
+            return jsonify(_err(result.get("error", "Unknown error"))), 400
             
     except Exception as e:
-        logger.error(f"Error creating drawing: {e}")
-        logger.error(traceback.format_exc())
-        return jsonify({
-            "success": False,
-            "error": str(e),
-            "timestamp": datetime.now().isoformat()
-        }), 500
+        logger.exception("Error creating drawing: %s", e)
+        return jsonify(_err(str(e))), 500
 
 @app.route('/api/v1/natural', methods=['POST'])
 def process_natural_language():
     """Process natural language request"""
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "No JSON data provided"}), 400
+        req, error = _decode_body(_NATURAL_DEC)
+        if error:
+            return error
         
-        # Validate required fields
-        if 'text' not in data:
-            return jsonify({"error": "Missing 'text' field"}), 400
-        
-        natural_text = data['text']
+        natural_text = req.text
         
         # Get agent
         agent = get_agent()
@@ -202,40 +340,23 @@ def process_natural_language():
         result = agent.process_natural_language_request(natural_text)
         
         if result:
-            return jsonify({
-                "success": True,
-                "specifications": result,
-                "timestamp": datetime.now().isoformat()
-            }), 200
+            return jsonify(_ok(specifications=result)), 200
         else:
-            return jsonify({
-                "success": False,
-                "error": "Failed to parse natural language request",
-                "timestamp": datetime.now().isoformat()
-            }), 400
+            return jsonify(_err("Failed to parse natural language request")), 400
             
     except Exception as e:
-        logger.error(f"Error processing natural language: {e}")
-        logger.error(traceback.format_exc())
-        return jsonify({
-            "success": False,
-            "error": str(e),
-            "timestamp": datetime.now().isoformat()
-        }), 500
+        logger.exception("Error processing natural language: %s", e)
+        return jsonify(_err(str(e))), 500
 
 @app.route('/api/v1/natural-draw', methods=['POST'])
 def natural_language_draw():
     """Process natural language and create drawing in one step"""
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "No JSON data provided"}), 400
-        
-        # Validate required fields
-        if 'text' not in data:
-            return jsonify({"error": "Missing 'text' field"}), 400
+        req, error = _decode_body(_NATURAL_DEC)
+        if error:
+            return error
         
-        natural_text = data['text']
+        natural_text = req.text
         
         # Get agent
         agent = get_agent()
@@ -244,69 +365,50 @@ def natural_language_draw():
         result = agent.create_complete_drawing(natural_text)
         
         if result.get("success"):
-            return jsonify({
-                "success": True,
-                "message": "Drawing created successfully from natural language",
-                "result": result,
-                "timestamp": datetime.now().isoformat()
-            }), 200
+            return jsonify(_ok(
+                message="Drawing created successfully from natural language",
+                result=result
+            )), 200
         else:
-            return jsonify({
-                "success": False,
-                "error": result.get("error", "Unknown error"),
-                "timestamp": datetime.now().isoformat()
-            }), 400
+            return jsonify(_err(result.get("error", "Unknown error"))), 400
             
     except Exception as e:
-        logger.error(f"Error in natural language draw: {e}")
-        logger.error(traceback.format_exc())
-        return jsonify({
-            "success": False,
-            "error": str(e),
-            "timestamp": datetime.now().isoformat()
-        }), 500
+        logger.exception("Error in natural language draw: %s", e)
+        return jsonify(_err(str(e))), 500
 
 @app.route('/api/v1/batch', methods=['POST'])
 def batch_process():
     """Process multiple drawing requests"""
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "No JSON data provided"}), 400
-        
-        # Validate required fields
-        if 'requests' not in data:
-            return jsonify({"error": "Missing 'requests' field"}), 400
+        req, error = _decode_body(_BATCH_DEC)
+        if error:
+            return error
         
-        requests_list = data['requests']
-        if not isinstance(requests_list, list):
-            return jsonify({"error": "'requests' must be a list"}), 400
+        requests_list = req.requests
         
         # Get agent
         agent = get_agent()
         
-        # Process batch requests
-        results = agent.batch_process_requests(requests_list)
+        # Parse requests concurrently (OpenAI calls are network-bound), then
+        # draw sequentially on this thread since AutoCAD COM is single-apartment
+        workers = max(1, min(BATCH_MAX_WORKERS, len(requests_list)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            parsed_specs = list(executor.map(agent.process_natural_language_request, requests_list))
+        
+        results = [agent.create_complete_drawing(specs) for specs in parsed_specs]
         
         successful = sum(1 for r in results if r.get("success"))
         
-        return jsonify({
-            "success": True,
-            "total_requests": len(requests_list),
-            "successful": successful,
-            "failed": len(requests_list) - successful,
-            "results": results,
-            "timestamp": datetime.now().isoformat()
-        }), 200
+        return jsonify(_ok(
+            total_requests=len(requests_list),
+            successful=successful,
+            failed=len(requests_list) - successful,
+            results=results
+        )), 200
             
     except Exception as e:
-        logger.error(f"Error in batch processing: {e}")
-        logger.error(traceback.format_exc())
-        return jsonify({
-            "success": False,
-            "error": str(e),
-            "timestamp": datetime.now().isoformat()
-        }), 500
+        logger.exception("Error in batch processing: %s", e)
+        return jsonify(_err(str(e))), 500
 
 @app.route('/api/v1/commands', methods=['GET'])
 def get_available_commands():
@@ -315,19 +417,11 @@ def get_available_commands():
         agent = get_agent()
         commands = agent.get_available_commands()
         
-        return jsonify({
-            "success": True,
-            "commands": commands,
-            "timestamp": datetime.now().isoformat()
-        }), 200
+        return jsonify(_ok(commands=commands)), 200
             
     except Exception as e:
-        logger.error(f"Error getting commands: {e}")
-        return jsonify({
-            "success": False,
-            "error": str(e),
-            "timestamp": datetime.now().isoformat()
-        }), 500
+        logger.exception("Error getting commands: %s", e)
+        return jsonify(_err(str(e))), 500
 
 @app.route('/api/v1/lighting-systems', methods=['GET'])
 def get_lighting_systems():
@@ -336,109 +430,59 @@ def get_lighting_systems():
         agent = get_agent()
         systems = agent.get_lighting_systems()
         
-        return jsonify({
-            "success": True,
-            "lighting_systems": systems,
-            "timestamp": datetime.now().isoformat()
-        }), 200
+        return jsonify(_ok(lighting_systems=systems)), 200
             
     except Exception as e:
-        logger.error(f"Error getting lighting systems: {e}")
-        return jsonify({
-            "success": False,
-            "error": str(e),
-            "timestamp": datetime.now().isoformat()
-        }), 500
+        logger.exception("Error getting lighting systems: %s", e)
+        return jsonify(_err(str(e))), 500
 
 @app.route('/api/v1/config', methods=['GET'])
 def get_configuration():
     """Get current configuration"""
-    try:
-        config_data = {
-            "openai_model": config.OPENAI_MODEL,
-            "openai_temperature": config.OPENAI_TEMPERATURE,
-            "openai_max_tokens": config.OPENAI_MAX_TOKENS,
-            "autocad_timeout": config.AUTOCAD_TIMEOUT,
-            "autocad_command_delay": config.AUTOCAD_COMMAND_DELAY,
-            "default_units": config.DEFAULT_UNITS,
-            "command_map": config.COMMAND_MAP,
-            "lighting_systems": config.LIGHTING_SYSTEMS,
-            "color_temperatures": config.COLOR_TEMPERATURES,
-            "lens_options": config.LENS_OPTIONS,
-            "mounting_options": config.MOUNTING_OPTIONS
-        }
-        
-        return jsonify({
-            "success": True,
-            "configuration": config_data,
-            "timestamp": datetime.now().isoformat()
-        }), 200
-            
-    except Exception as e:
-        logger.error(f"Error getting configuration: {e}")
-        return jsonify({
-            "success": False,
-            "error": str(e),
-            "timestamp": datetime.now().isoformat()
-        }), 500
+    if _CONFIG_ETAG in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(_CONFIG_BYTES, mimetype='application/json')
+    response.set_etag(_CONFIG_ETAG)
+    return response
 
 @app.route('/api/v1/validate', methods=['POST'])
 def validate_specifications():
     """Validate drawing specifications without executing"""
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "No JSON data provided"}), 400
-        
-        # Validate required fields
-        if 'specifications' not in data:
-            return jsonify({"error": "Missing 'specifications' field"}), 400
-        
-        specs = data['specifications']
+        req, error = _decode_body(_DRAW_DEC)
+        if error:
+            return error
         
-        # Get agent
-        agent = get_agent()
+        specs = req.specifications
         
-        # Validate specifications
-        is_valid = agent._validate_specifications(specs)
+        # Validate specifications against the compiled schema
+        try:
+            _VALIDATE(specs)
+            is_valid = True
+        except fastjsonschema.JsonSchemaException as e:
+            logger.error("Invalid specifications: %s", e.message)
+            is_valid = False
         
         if is_valid:
-            return jsonify({
-                "success": True,
-                "valid": True,
-                "message": "Specifications are valid",
-                "timestamp": datetime.now().isoformat()
-            }), 200
+            return jsonify(_ok(valid=True, message="Specifications are valid")), 200
         else:
-            return jsonify({
-                "success": False,
-                "valid": False,
-                "error": "Invalid specifications",
-                "timestamp": datetime.now().isoformat()
-            }), 400
+            return jsonify(_err("Invalid specifications", valid=False)), 400
             
     except Exception as e:
-        logger.error(f"Error validating specifications: {e}")
-        return jsonify({
-            "success": False,
-            "error": str(e),
-            "timestamp": datetime.now().isoformat()
-        }), 500
+        logger.exception("Error validating specifications: %s", e)
+        return jsonify(_err(str(e))), 500
 
 @app.route('/api/v1/export', methods=['POST'])
 def export_drawing():
     """Export drawing to file format"""
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "No JSON data provided"}), 400
+        req, error = _decode_body(_EXPORT_DEC)
+        if error:
+            return error
         
-        # Validate required fields
-        if 'specifications' not in data:
-            return jsonify({"error": "Missing 'specifications' field"}), 400
-        
-        specs = data['specifications']
-        export_format = data.get('format', 'dwg')  # Default to DWG
+        specs = req.specifications
+        export_format = req.format
         
         # Get agent
         agent = get_agent()
@@ -447,28 +491,18 @@ def export_drawing():
         result = agent.create_complete_drawing(specs)
         
         if not result.get("success"):
-            return jsonify({
-                "success": False,
-                "error": result.get("error", "Failed to create drawing"),
-                "timestamp": datetime.now().isoformat()
-            }), 400
+            return jsonify(_err(result.get("error", "Failed to create drawing"))), 400
         
         # For now, return success message
         # In a real implementation, you would export the drawing file
-        return jsonify({
-            "success": True,
-            "message": f"Drawing created and ready for {export_format.upper()} export",
-            "format": export_format,
-            "timestamp": datetime.now().isoformat()
-        }), 200
+        return jsonify(_ok(
+            message=f"Drawing created and ready for {export_format.upper()} export",
+            format=export_format
+        )), 200
             
     except Exception as e:
-        logger.error(f"Error exporting drawing: {e}")
-        return jsonify({
-            "success": False,
-            "error": str(e),
-            "timestamp": datetime.now().isoformat()
-        }), 500
+        logger.exception("Error exporting drawing: %s", e)
+        return jsonify(_err(str(e))), 500
 
 @app.route('/api/v1/status', methods=['GET'])
 def get_status():
@@ -478,51 +512,39 @@ def get_status():
         autocad_ok = validate_autocad_connection()
         
         # Check OpenAI API key
-        openai_ok = bool(os.getenv('OPENAI_API_KEY'))
+        openai_ok = _OPENAI_OK
         
         # Get agent status
-        agent_status = "initialized" if agent is not None else "not_initialized"
+        agent_status = "initialized" if get_agent.cache_info().currsize > 0 else "not_initialized"
         
-        return jsonify({
-            "success": True,
-            "status": {
+        timestamp = _now()
+        return jsonify(_ok(
+            status={
                 "autocad_connection": autocad_ok,
                 "openai_api_key": openai_ok,
                 "agent_status": agent_status,
-                "server_time": datetime.now().isoformat()
+                "server_time": timestamp
             },
-            "timestamp": datetime.now().isoformat()
-        }), 200
+            timestamp=timestamp
+        )), 200
             
     except Exception as e:
-        logger.error(f"Error getting status: {e}")
-        return jsonify({
-            "success": False,
-            "error": str(e),
-            "timestamp": datetime.now().isoformat()
-        }), 500
+        logger.exception("Error getting status: %s", e)
+        return jsonify(_err(str(e))), 500
 
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
-    return jsonify({
-        "success": False,
-        "error": "Endpoint not found",
-        "timestamp": datetime.now().isoformat()
-    }), 404
+    return jsonify(_err("Endpoint not found")), 404
 
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors"""
-    return jsonify({
-        "success": False,
-        "error": "Internal server error",
-        "timestamp": datetime.now().isoformat()
-    }), 500
+    return jsonify(_err("Internal server error")), 500
 
 if __name__ == '__main__':
     # Check environment
-    if not os.getenv('OPENAI_API_KEY'):
+    if not _OPENAI_OK:
         logger.error("OPENAI_API_KEY environment variable is required")
         exit(1)
     
@@ -534,5 +556,10 @@ if __name__ == '__main__':
     port = int(os.getenv('PORT', 5000))
     debug = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
     
-    logger.info(f"Starting AutoDraw API server on port {port}")
-    app.run(host='0.0.0.0', port=port, debug=debug) 
\ No newline at end of file
+    logger.info("Starting AutoDraw API server on port %s", port)
+    if debug:
+        app.run(host='0.0.0.0', port=port, debug=debug)
+    else:
+        # Production WSGI server; each worker thread keeps its own COM proxy
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=port, threads=int(os.getenv('WAITRESS_THREADS', 8)))
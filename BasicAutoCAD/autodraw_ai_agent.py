@@ -1,40 +1,195 @@
-from urllib import response
-import openai
 import win32com.client
 import json
+import math
 import re
 import os
-import sys
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional, TypedDict
 import logging
 from datetime import datetime
 import threading
+import time
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
+import functools
+from collections import deque
+from contextlib import contextmanager
+import asyncio
 import pythoncom
-import traceback
-import os
+import pywintypes
 import httpx
-from openai import OpenAI
+from array import array
+from itertools import chain
+from openai import AsyncOpenAI, OpenAI
 
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Shape of the drawing specifications produced by the parser; static typing only
+class SpecDims(TypedDict, total=False):
+    length: float
+    width: float
+    height: float
+
+class SpecInner(TypedDict, total=False):
+    wattage: float
+    color_temperature: str
+    lens_type: str
+    mounting_type: str
+    driver_type: str
+    quantity: int
+
+class Spec(TypedDict, total=False):
+    command: str
+    lighting_system: str
+    dimensions: SpecDims
+    position: Dict
+    specifications: SpecInner
+    additional_parameters: Dict
+
+# COM type tag for point arrays (doubles), built once
+_VT_R8_ARRAY = pythoncom.VT_ARRAY | pythoncom.VT_R8
+_VARIANT = win32com.client.VARIANT
+
+# Origin point, shared by every call that needs one
+_ZERO_POINT = _VARIANT(_VT_R8_ARRAY, [0.0, 0.0, 0.0])
+
+# HRESULTs meaning the AutoCAD COM server is gone: RPC_E_DISCONNECTED,
+# RPC_S_SERVER_UNAVAILABLE, RPC_E_SERVERFAULT
+RECONNECT_HRESULTS = {0x80010108, 0x800706BA, 0x80010105}
+
+# Command-line selection of every object in the drawing
+_ALL_OBJECTS = '(ssget "_X")'
+
+# Commands drawn as lighting fixtures; these also require a lighting_system
+_LIGHTING_COMMANDS = frozenset({
+    "linear_light", "linear_light_reflector", "rush_light", "rush_recessed", "pg_light", "magneto_track"
+})
+
+# Block drawn in place of missing blocks; its NAME attribute shows the
+# requested block name
+_PLACEHOLDER_BLOCK = "_PLACEHOLDER_BLK"
+
+# File suffix of importable asset drawings (compared lowercased)
+_DWG_SUFFIX = '.dwg'
+
+# Placeholder marking where the user request goes in the parsing prompt
+_USER_INPUT_MARKER = "\x00USER_INPUT\x00"
+
+# System message sent with every parsing request
+_SYSTEM_MESSAGE = {"role": "system", "content": "You are an expert AutoCAD lighting design assistant. Parse user requests into structured specifications."}
+
+# Model replies sometimes wrap the JSON object in code fences or prose
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*\})\s*```", re.DOTALL)
+_JSON_OBJ_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def _extract_json(content: str) -> str:
+    """Return the JSON object text from a model reply, dropping fences and prose."""
+    match = _JSON_FENCE_RE.search(content)
+    if match:
+        return match.group(1)
+    match = _JSON_OBJ_RE.search(content)
+    return match.group(0) if match else content
+
+
+# Requests simple enough to parse without the model
+_NUM = r"(-?\d+(?:\.\d+)?)"
+# Only these filler words may sit between the parts; any other detail
+# (layer, color, rotation, a second entity) sends the request to the model
+_FILL = r"\s*(?:\b(?:with|of|and)\b\s*)*"
+_RE_CIRCLE = re.compile(rf"^(?:draw|create|add)?\s*(?:an?\s+)?circle{_FILL}\bat\s*\(?{_NUM}\s*,\s*{_NUM}\)?{_FILL}\bradius\s*(?:of\s*)?{_NUM}\s*$", re.I)
+_RE_RECTANGLE = re.compile(rf"^(?:draw|create|add)?\s*(?:an?\s+)?rectangle{_FILL}\bfrom\s*\(?{_NUM}\s*,\s*{_NUM}\)?\s*to\s*\(?{_NUM}\s*,\s*{_NUM}\)?\s*$", re.I)
+
+
+def _early_bind(com_object):
+    """Wrap a COM object in its makepy-generated class, or return it unchanged."""
+    try:
+        return win32com.client.gencache.EnsureDispatch(com_object)
+    except Exception as e:
+        logger.debug(f"Early binding unavailable, using late binding: {e}")
+        return com_object
+
+
+def _fast_path_specification(user_input: str) -> Optional[Spec]:
+    """Build a specification directly for requests the fast-path patterns cover."""
+    match = _RE_CIRCLE.match(user_input)
+    if match:
+        x, y, radius = map(float, match.groups())
+        return {
+            "command": "circle",
+            "dimensions": {"radius": radius},
+            "position": {"center_point": [x, y, 0.0]}
+        }
+    match = _RE_RECTANGLE.match(user_input)
+    if match:
+        x1, y1, x2, y2 = map(float, match.groups())
+        return {
+            "command": "rectangle",
+            "position": {"start_point": [x1, y1, 0.0], "end_point": [x2, y2, 0.0]}
+        }
+    return None
+
+
+_log_error = logger.error
+
+
+def _autocad_op(action: str):
+    """
+    Decorate a drawing handler so any exception is logged as "Failed to
+    <action>" and reported as a False result.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                _log_error("Failed to %s: %s", action, e)
+                return False
+        return wrapper
+    return decorate
+
+
+class _DocumentEvents:
+    """AcadDocument event sink; command_ended is attached by _document_events."""
+    
+    def OnEndCommand(self, CommandName):
+        self.command_ended.set()
+
+
 class AutoDrawAIAgent:
     """
     AI Agent for AutoCAD drawing automation using natural language processing.
     Leverages existing AutoLISP functions for lighting design automation.
     """
     
-    def __init__(self, openai_api_key: str = None, initialize_autocad: bool = True):
+    # Sync OpenAI clients shared across agents, keyed by API key and pool size
+    _clients_by_key: Dict[tuple, OpenAI] = {}
+    _clients_lock = threading.Lock()
+    
+    def __init__(self, openai_api_key: str = None, initialize_autocad: bool = True,
+                 max_connections: int = 1000, max_keepalive_connections: int = 100):
 
         self.openai_api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         if not self.openai_api_key:
             raise ValueError("OpenAI API key is required")
 
-        http_client = httpx.Client(timeout=httpx.Timeout(60.0),trust_env=False)
+        # Connection pool limits for the sync and async OpenAI clients
+        self._http_limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=30.0
+        )
+
+        self.openai_client = type(self)._get_or_create_client(self.openai_api_key, self._http_limits)
 
-        self.openai_client = OpenAI(api_key=self.openai_api_key,http_client=http_client)
+        # Async client for callers that run their own event loop
+        self.async_openai_client = self._new_async_openai_client()
+
+        # Raw model replies keyed by normalized request text
+        self._cached_completion = functools.lru_cache(maxsize=512)(self._request_completion)
 
         self._thread_local = threading.local()
 
@@ -109,15 +264,35 @@ class AutoDrawAIAgent:
             "2700k", "3000k", "3500k", "4000k", "5000k", "6500k"
         ]
         
+        # Drawing handler per command, built once
+        self._command_dispatch = self._build_command_dispatch()
+        
+        # Static parts of the parsing prompt, rendered once
+        self._prompt_prefix, self._prompt_suffix = self._build_parsing_prompt_parts()
+        
         logger.info("AutoDraw AI Agent initialized successfully")
     
+    @classmethod
+    def _get_or_create_client(cls, api_key: str, limits: httpx.Limits) -> OpenAI:
+        """Return the shared OpenAI client for this key and pool size, creating it once."""
+        key = (api_key, limits.max_connections, limits.max_keepalive_connections)
+        with cls._clients_lock:
+            client = cls._clients_by_key.get(key)
+            if client is None:
+                http_client = httpx.Client(timeout=httpx.Timeout(60.0),trust_env=False,limits=limits)
+                client = OpenAI(api_key=api_key,http_client=http_client)
+                cls._clients_by_key[key] = client
+            return client
+    
     def _initialize_autocad_connection(self):
         """Initialize AutoCAD COM connection for the current thread."""
         try:
-            # Initialize COM for this thread
-            pythoncom.CoInitialize()
+            # Initialize COM for this thread, once; reconnects reuse it
+            if not getattr(self._thread_local, 'com_inited', False):
+                pythoncom.CoInitialize()
+                self._thread_local.com_inited = True
             
-            print("I am here P1")
+            logger.debug("COM initialized, connecting to AutoCAD")
             
             # Try to get existing AutoCAD instance first
             try:
@@ -128,9 +303,20 @@ class AutoDrawAIAgent:
                 self._thread_local.autocad = win32com.client.Dispatch("AutoCAD.Application")
                 logger.info("Created new AutoCAD instance")
             
-            # Wait a moment for AutoCAD to fully initialize
-            import time
-            time.sleep(1.0)
+            # Early-bind so documents, model space and their Add* methods
+            # dispatch through the type library instead of name lookups
+            self._thread_local.autocad = _early_bind(self._thread_local.autocad)
+            
+            # Wait for AutoCAD to answer, backing off up to 5 seconds
+            deadline = time.monotonic() + 5.0
+            delay = 0.01
+            while time.monotonic() < deadline:
+                try:
+                    self._thread_local.autocad.Name
+                    break
+                except Exception:
+                    time.sleep(delay)
+                    delay = min(delay * 2, 0.2)
             
             # Check if AutoCAD is properly connected
             try:
@@ -170,6 +356,8 @@ class AutoDrawAIAgent:
             # Get ModelSpace
             try:
                 self._thread_local.modelspace = self._thread_local.doc.ModelSpace
+                # Remembered entities are checked against this, see _recent_object
+                self._thread_local.modelspace_id = self._thread_local.modelspace.ObjectID
                 logger.info("Successfully accessed ModelSpace")
             except Exception as e:
                 logger.error(f"Error accessing ModelSpace: {e}")
@@ -179,25 +367,44 @@ class AutoDrawAIAgent:
         except Exception as e:
             logger.error(f"Failed to connect to AutoCAD: {e}")
             try:
-                pythoncom.CoUninitialize()
+                self._uninitialize_com()
             except:
                 pass
             raise
     
-    def _get_autocad_objects(self):
-        """Get AutoCAD objects for the current thread, reconnecting if necessary."""
+    def _get_autocad_objects(self, verify: bool = False):
+        """
+        Get AutoCAD objects for the current thread.
+        
+        The application, document and model space are cached per thread and
+        returned without any COM calls. With verify=True the connection is
+        probed first and re-established if AutoCAD has gone away.
+        """
         try:
             # Check if we have valid COM objects for this thread
-            if not hasattr(self._thread_local, 'autocad') or self._thread_local.autocad is None:
+            if getattr(self._thread_local, 'autocad', None) is None:
                 self._initialize_autocad_connection()
+            elif not verify:
+                return self._thread_local.autocad, self._thread_local.doc, self._thread_local.modelspace
             
             # Test the connection
             try:
                 # Try to access the active document
                 doc = self._thread_local.autocad.ActiveDocument
                 # If we get here, the connection is working
-                return self._thread_local.autocad, doc, self._thread_local.modelspace
-            except Exception as e:
+                if doc != self._thread_local.doc:
+                    # Another drawing is active: use its model space and
+                    # drop entities remembered from the previous one
+                    self._thread_local.doc = doc
+                    self._thread_local.modelspace = doc.ModelSpace
+                    self._thread_local.modelspace_id = self._thread_local.modelspace.ObjectID
+                    self._thread_local.recent_objects = None
+                return self._thread_local.autocad, self._thread_local.doc, self._thread_local.modelspace
+            except pywintypes.com_error as e:
+                # Only a dead server needs the full teardown; anything else is
+                # left to the caller
+                if (e.hresult & 0xFFFFFFFF) not in RECONNECT_HRESULTS:
+                    raise
                 logger.info(f"AutoCAD connection broken, reconnecting... Error: {e}")
                 # Connection is broken, reinitialize
                 self._cleanup_autocad_connection()
@@ -215,33 +422,280 @@ class AutoDrawAIAgent:
                 self._thread_local.autocad = None
                 self._thread_local.doc = None
                 self._thread_local.modelspace = None
-            pythoncom.CoUninitialize()
+                self._thread_local.modelspace_id = None
+            self._thread_local.recent_objects = None
+            self._thread_local.doc_events = None
+            self._uninitialize_com()
         except Exception as e:
             logger.error(f"Error cleaning up AutoCAD connection: {e}")
     
-    def process_natural_language_request(self, user_input: str) -> Dict:
+    def _remember_object(self, obj):
+        """Record an entity this thread just created, newest last."""
+        recent = getattr(self._thread_local, 'recent_objects', None)
+        if recent is None:
+            recent = self._thread_local.recent_objects = deque(maxlen=8)
+        recent.append(obj)
+    
+    def _recent_object(self, modelspace, back: int = 1):
+        """
+        Return the entity created `back` steps ago (1 = newest).
+        
+        Served from the objects this agent created on the current thread; falls
+        back to indexing model space when it has not created that many, or
+        when the remembered entity is gone or belongs to another drawing.
+        """
+        recent = getattr(self._thread_local, 'recent_objects', None)
+        if recent is not None and len(recent) >= back:
+            obj = recent[-back]
+            try:
+                # Erased or undone entities raise on access; the model space
+                # ObjectID is cached with the model space
+                if obj.OwnerID == self._thread_local.modelspace_id:
+                    return obj
+            except pywintypes.com_error:
+                pass
+            recent.clear()
+        return modelspace.Item(modelspace.Count - back)
+    
+    def _recent_object_count(self) -> int:
+        """Number of entities this thread has created and still remembers."""
+        recent = getattr(self._thread_local, 'recent_objects', None)
+        return 0 if recent is None else len(recent)
+    
+    def _uninitialize_com(self):
+        """Balance this thread's CoInitialize, if it made one."""
+        if getattr(self._thread_local, 'com_inited', False):
+            self._thread_local.com_inited = False
+            pythoncom.CoUninitialize()
+    
+    def process_natural_language_request(self, user_input: str, no_cache: bool = False, fast_path: bool = False) -> Spec:
         """
         Process natural language input and extract drawing specifications.
         
         Args:
             user_input: Natural language description of the drawing requirements
+            no_cache: Ask the model again even if this request was parsed before
+            fast_path: Parse simple circle/rectangle requests locally, without
+                calling the model
             
         Returns:
             Dictionary containing parsed specifications
         """
         try:
-            prompt = self._create_parsing_prompt(user_input)
-
+            # Whitespace-only differences share a cache entry; case is kept
+            # since it matters for text content
+            normalized_input = " ".join(user_input.split())
+            
+            if fast_path:
+                specification = _fast_path_specification(normalized_input)
+                if specification is not None:
+                    return specification
+            if no_cache:
+                content = self._request_completion(normalized_input)
+            else:
+                content = self._cached_completion(normalized_input)
+            
+            return json.loads(content)
 
-            response = self.openai_client.chat.completions.create(model="gpt-4.1-mini",messages=[{"role": "system", "content": "You are an expert AutoCAD lighting design assistant. Parse user requests into structured specifications."},{"role": "user", "content": prompt}],temperature=0.1,max_tokens=1000)
+        except Exception as e:
+           logger.error(f"NLP parsing failed: {e}")
+           return self._create_default_specification(user_input)
+    
+    def _request_completion(self, user_input: str) -> str:
+        """Ask the model to parse one request and return the raw JSON reply."""
+        response = self.openai_client.chat.completions.create(**self._parsing_request_body(user_input))
+        content = _extract_json(response.choices[0].message.content)
+        # Validate before the reply can be cached
+        json.loads(content)
+        return content
+    
+    async def aprocess_natural_language_request(self, user_input: str, client: Optional[AsyncOpenAI] = None) -> Spec:
+        """
+        Async variant of process_natural_language_request.
+        
+        Args:
+            user_input: Natural language description of the drawing requirements
+            client: Async OpenAI client to use; defaults to the agent's own
+            
+        Returns:
+            Dictionary containing parsed specifications
+        """
+        try:
+            client = client or self.async_openai_client
+            response = await client.chat.completions.create(**self._parsing_request_body(user_input))
             
-            return json.loads(response.choices[0].message.content)
+            return json.loads(_extract_json(response.choices[0].message.content))
 
         except Exception as e:
            logger.error(f"NLP parsing failed: {e}")
            return self._create_default_specification(user_input)
     
-    def _create_default_specification(self, user_input: str) -> Dict:
+    def process_many(self, user_inputs: List[str], max_concurrency: int = 20) -> List[Spec]:
+        """
+        Parse many requests concurrently from synchronous code.
+        
+        Args:
+            user_inputs: Natural language drawing requests
+            max_concurrency: Maximum requests in flight, sized to the rate limit
+            
+        Returns:
+            Parsed specifications in input order
+        """
+        async def run():
+            # httpx connections are bound to their event loop, so each
+            # asyncio.run gets its own client
+            async with self._new_async_openai_client() as client:
+                semaphore = asyncio.Semaphore(max_concurrency)
+                
+                async def parse(user_input):
+                    async with semaphore:
+                        return await self.aprocess_natural_language_request(user_input, client)
+                
+                return await asyncio.gather(*(parse(user_input) for user_input in user_inputs))
+        
+        return list(asyncio.run(run()))
+    
+    def _new_async_openai_client(self) -> AsyncOpenAI:
+        """Create an async OpenAI client with a pooled HTTP connection."""
+        http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(60.0),
+            limits=self._http_limits,
+            trust_env=False
+        )
+        return AsyncOpenAI(api_key=self.openai_api_key, http_client=http_client)
+    
+    def _parsing_request_body(self, user_input: str) -> Dict:
+        """Chat completion arguments for parsing a single user request."""
+        return {
+            "model": "gpt-4.1-mini",
+            "messages": [_SYSTEM_MESSAGE, {"role": "user", "content": self._create_parsing_prompt(user_input)}],
+            "temperature": 0.1,
+            "max_tokens": 600,
+            "response_format": {"type": "json_object"}
+        }
+    
+    def process_natural_language_requests(self, user_inputs: List[str], batch_size: int = 10) -> List[Spec]:
+        """
+        Parse several requests per chat completion call.
+        
+        Requests are sent in groups of batch_size as a numbered list and the
+        model returns them as a JSON array, so a group costs one round trip and one
+        copy of the system prompt and option lists.
+        
+        Args:
+            user_inputs: Natural language drawing requests
+            batch_size: Maximum requests per completion call
+            
+        Returns:
+            Parsed specifications in input order
+        """
+        results = []
+        
+        for start in range(0, len(user_inputs), batch_size):
+            chunk = user_inputs[start:start + batch_size]
+            if len(chunk) == 1:
+                results.append(self.process_natural_language_request(chunk[0]))
+                continue
+            
+            parsed = {}
+            try:
+                response = self.openai_client.chat.completions.create(
+                    model="gpt-4.1-mini",
+                    messages=[_SYSTEM_MESSAGE, {"role": "user", "content": self._create_multi_parsing_prompt(chunk)}],
+                    temperature=0.1,
+                    max_tokens=600 * len(chunk),
+                    response_format={"type": "json_object"}
+                )
+                items = json.loads(response.choices[0].message.content)
+                if isinstance(items, dict):
+                    # JSON mode replies with an object wrapping the array
+                    items = items.get("results") or next((v for v in items.values() if isinstance(v, list)), [])
+                
+                # Match objects to requests by index, falling back to position
+                for position, item in enumerate(items, 1):
+                    if isinstance(item, dict):
+                        index = item.pop("index", position)
+                        if isinstance(index, int) and 1 <= index <= len(chunk):
+                            parsed.setdefault(index, item)
+            except Exception as e:
+                logger.error(f"Multi-request NLP parsing failed: {e}")
+            
+            # Anything the model dropped is parsed on its own
+            for i, user_input in enumerate(chunk, 1):
+                results.append(parsed[i] if i in parsed else self.process_natural_language_request(user_input))
+        
+        return results
+    
+    def process_natural_language_requests_batch(self, user_inputs: List[str], poll_interval: float = 10.0) -> List[Spec]:
+        """
+        Parse many requests through the OpenAI Batch API.
+        
+        Intended for bulk/offline jobs: one JSONL upload replaces a round trip
+        per request, at the cost of waiting for the batch to complete.
+        
+        Args:
+            user_inputs: Natural language drawing requests
+            poll_interval: Seconds between batch status checks
+            
+        Returns:
+            Parsed specifications in input order; requests that fail fall back
+            to the default specification
+        """
+        if len(user_inputs) <= 1:
+            return [self.process_natural_language_request(user_input) for user_input in user_inputs]
+        
+        try:
+            # One chat completion request per line, keyed by input index
+            lines = [
+                json.dumps({
+                    "custom_id": str(i),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._parsing_request_body(user_input)
+                })
+                for i, user_input in enumerate(user_inputs)
+            ]
+            batch_file = self.openai_client.files.create(
+                file=("parsing_requests.jsonl", "\n".join(lines).encode("utf-8")),
+                purpose="batch"
+            )
+            batch = self.openai_client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            logger.info(f"Submitted batch {batch.id} with {len(user_inputs)} requests")
+            
+            # Wait for the batch to reach a terminal state
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                time.sleep(poll_interval)
+                batch = self.openai_client.batches.retrieve(batch.id)
+            
+            if batch.status != "completed" or not batch.output_file_id:
+                raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+            
+            # Output lines are not guaranteed to be in input order
+            parsed = {}
+            for line in self.openai_client.files.content(batch.output_file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                try:
+                    body = item["response"]["body"]
+                    parsed[int(item["custom_id"])] = json.loads(_extract_json(body["choices"][0]["message"]["content"]))
+                except Exception as e:
+                    logger.error(f"NLP parsing failed for batch item {item.get('custom_id')}: {e}")
+            
+            return [
+                parsed[i] if i in parsed else self._create_default_specification(user_input)
+                for i, user_input in enumerate(user_inputs)
+            ]
+        
+        except Exception as e:
+            logger.error(f"Batch NLP parsing failed: {e}")
+            return [self._create_default_specification(user_input) for user_input in user_inputs]
+    
+    def _create_default_specification(self, user_input: str) -> Spec:
         """Create a default specification when AI parsing fails"""
         logger.info("Creating default specification for linear light")
         return {
@@ -270,10 +724,39 @@ class AutoDrawAIAgent:
     
     def _create_parsing_prompt(self, user_input: str) -> str:
         """Create a detailed prompt for parsing user input."""
-        return f"""
+        self._ensure_prompt_parts()
+        return self._prompt_prefix + user_input + self._prompt_suffix
+    
+    def _create_multi_parsing_prompt(self, user_inputs: List[str]) -> str:
+        """Create a prompt asking for one specification per numbered request."""
+        self._ensure_prompt_parts()
+        count = len(user_inputs)
+        numbered = "\n".join(f"        {i}) {text}" for i, text in enumerate(user_inputs, 1))
+        # The suffix starts with the closing quote of the single-request line
+        return (
+            f"\n        Parse each of these {count} AutoCAD drawing requests into JSON format:\n"
+            f"        \n        User Requests:\n{numbered}"
+            + self._prompt_suffix[1:]
+            + f"\n        Return a JSON object whose \"results\" field is an array of {count} such objects, one per request and in the same order.\n"
+            f"        Add an \"index\" field to each object holding the request's number.\n"
+        )
+    
+    def _ensure_prompt_parts(self):
+        """Build the static prompt parts for agents created without __init__."""
+        if not hasattr(self, '_prompt_prefix'):
+            self._prompt_prefix, self._prompt_suffix = self._build_parsing_prompt_parts()
+    
+    def _build_parsing_prompt_parts(self) -> Tuple[str, str]:
+        """
+        Build the static parts of the parsing prompt.
+        
+        The available options never change after __init__, so the prompt is
+        rendered once and split around the user request.
+        """
+        prompt = f"""
         Parse this AutoCAD drawing request into JSON format:
         
-        User Request: "{user_input}"
+        User Request: "{_USER_INPUT_MARKER}"
         
         Available lighting systems: {list(self.lighting_systems.keys())}
         Available mounting options: {self.mounting_options}
@@ -358,6 +841,8 @@ class AutoDrawAIAgent:
         - "rotate": Use base_point and angle
         - "scale": Use base_point and scale_factor
         """
+        prefix, suffix = prompt.split(_USER_INPUT_MARKER)
+        return prefix, suffix
     
 
     def _convert_to_3d_point(self, point_list):
@@ -377,11 +862,26 @@ class AutoDrawAIAgent:
 
         return (x, y, z)
 
+    def _points_to_flat_float64(self, points_list):
+        """
+        Flatten a list of points into one array('d') of x, y, z triples.
+        
+        Uniform 3D numeric input is converted in a single C-level pass; anything
+        else (2D points, numeric strings, bad Z values) goes through
+        _convert_to_3d_point per vertex.
+        """
+        if all(len(point) == 3 for point in points_list):
+            try:
+                return array('d', chain.from_iterable(points_list))
+            except TypeError:
+                pass
+        return array('d', chain.from_iterable(map(self._convert_to_3d_point, points_list)))
+
     def _to_variant_3d_point(self, point):
-        return win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8, point)
+        """Wrap a 3D point as the double SAFEARRAY AutoCAD expects."""
+        return _VARIANT(_VT_R8_ARRAY, point)
 
     def _draw_lighting_fixture(self, specs, modelspace):
-        print("Running as:", os.getlogin())
         """
         Draw a linear light fixture in AutoCAD using start/end points.
         """
@@ -420,10 +920,10 @@ class AutoDrawAIAgent:
 
             # Example: create a simple line between start and end
             try:
-                modelspace.AddLine(self._to_variant_3d_point(start_point), self._to_variant_3d_point(end_point))
+                line = modelspace.AddLine(self._to_variant_3d_point(start_point), self._to_variant_3d_point(end_point))
+                self._remember_object(line)
             except Exception as e:
-                print("Drawing creation failed!")
-                traceback.print_exc()
+                logger.exception("Drawing creation failed")
                 return False  # ✅ Explicit failure
 
             # You can expand this to draw a rectangle, block, or more
@@ -433,210 +933,196 @@ class AutoDrawAIAgent:
             logger.error(f"Failed to draw linear light: {str(e)}")
             raise
 
+    @_autocad_op("draw rectangle")
     def _draw_rectangle(self, specs, modelspace):
         """Draw a rectangle in AutoCAD."""
-        try:
-            start = specs["position"]["start_point"]
-            end = specs["position"]["end_point"]
-            
-            start_point = self._convert_to_3d_point(start)
-            end_point = self._convert_to_3d_point(end)
-            
-            logger.info(f"Drawing rectangle from {start_point} to {end_point}")
-            
-            # Create rectangle using polyline with 4 points
-            x1, y1, z1 = start_point
-            x2, y2, z2 = end_point
-            
-            # Define the 4 corners of the rectangle
-            points = [
-                (x1, y1, z1),  # Bottom-left
-                (x2, y1, z1),  # Bottom-right
-                (x2, y2, z1),  # Top-right
-                (x1, y2, z1),  # Top-left
-                (x1, y1, z1)   # Back to start to close
-            ]
-            
-            # Convert points to variant array
-            point_array = []
-            for point in points:
-                point_array.extend(point)
-            
-            # Create closed polyline for rectangle
-            polyline = modelspace.AddPolyline(win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8, point_array))
-            polyline.Closed = True
-            
-            logger.info("Successfully drew rectangle.")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to draw rectangle: {str(e)}")
-            return False
+        start = specs["position"]["start_point"]
+        end = specs["position"]["end_point"]
+        
+        start_point = self._convert_to_3d_point(start)
+        end_point = self._convert_to_3d_point(end)
+        
+        logger.info(f"Drawing rectangle from {start_point} to {end_point}")
+        
+        # Create rectangle using polyline with 4 points
+        x1, y1, z1 = start_point
+        x2, y2, z2 = end_point
+        
+        # The rectangle is planar, so use a 2D lightweight polyline through
+        # the 4 corners at the start point's elevation
+        polyline = modelspace.AddLightWeightPolyline(_VARIANT(_VT_R8_ARRAY, array('d', (x1, y1, x2, y1, x2, y2, x1, y2))))
+        polyline.Closed = True
+        if z1:
+            polyline.Elevation = z1
+        self._remember_object(polyline)
+        
+        logger.info("Successfully drew rectangle.")
+        return True
 
+    @_autocad_op("draw circle")
     def _draw_circle(self, specs, modelspace):
         """Draw a circle in AutoCAD."""
-        try:
-            center = specs["position"]["center_point"]
-            radius = specs["dimensions"].get("radius", 1.0)
-            
-            center_point = self._convert_to_3d_point(center)
-            
-            logger.info(f"Drawing circle at {center_point} with radius {radius}")
-            
-            # Create circle using AddCircle method
-            # Convert center point to variant array
-            center_array = list(center_point)
-            circle = modelspace.AddCircle(win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8, center_array), radius)
-            
-            logger.info("Successfully drew circle.")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to draw circle: {str(e)}")
-            return False
+        center = specs["position"]["center_point"]
+        radius = specs["dimensions"].get("radius", 1.0)
+        
+        center_point = self._convert_to_3d_point(center)
+        
+        logger.info(f"Drawing circle at {center_point} with radius {radius}")
+        
+        # Create circle using AddCircle method
+        # Convert center point to variant array
+        center_array = center_point
+        circle = modelspace.AddCircle(_VARIANT(_VT_R8_ARRAY, center_array), radius)
+        self._remember_object(circle)
+        
+        logger.info("Successfully drew circle.")
+        return True
 
+    @_autocad_op("draw polyline")
     def _draw_polyline(self, specs, modelspace):
         """Draw a polyline in AutoCAD."""
-        try:
-            points = specs["position"]["points"]
-            closed = specs.get("closed", False)
-            
-            # Convert all points to 3D format and flatten to array
-            point_array = []
-            for point in points:
-                converted_point = self._convert_to_3d_point(point)
-                point_array.extend(converted_point)
-            
-            logger.info(f"Drawing polyline with {len(points)} points")
-            
-            # Create polyline using AddPolyline method
-            polyline = modelspace.AddPolyline(win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8, point_array))
-            
-            # Close the polyline if specified
-            if closed:
-                polyline.Closed = True
-            
-            logger.info("Successfully drew polyline.")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to draw polyline: {str(e)}")
-            return False
+        points = specs["position"]["points"]
+        closed = specs.get("closed", False)
+        
+        # Convert all points to 3D format and flatten to a double buffer
+        point_array = self._points_to_flat_float64(points)
+        
+        logger.info(f"Drawing polyline with {len(points)} points")
+        
+        # Planar polylines become lightweight 2D polylines; AddPolyline
+        # is kept for true 3D input
+        z_values = point_array[2::3]
+        if z_values and z_values.count(z_values[0]) == len(z_values):
+            # Preallocate the 2D buffer and copy X and Y across with
+            # strided slices instead of building per-vertex tuples
+            xy_array = array('d', bytes(16 * len(z_values)))
+            xy_array[0::2] = point_array[0::3]
+            xy_array[1::2] = point_array[1::3]
+            polyline = modelspace.AddLightWeightPolyline(_VARIANT(_VT_R8_ARRAY, xy_array))
+            if z_values[0]:
+                polyline.Elevation = z_values[0]
+        else:
+            polyline = modelspace.AddPolyline(_VARIANT(_VT_R8_ARRAY, point_array))
+        self._remember_object(polyline)
+        
+        # Close the polyline if specified
+        if closed:
+            polyline.Closed = True
+        
+        logger.info("Successfully drew polyline.")
+        return True
 
+    @_autocad_op("draw arc")
     def _draw_arc(self, specs, modelspace):
         """Draw an arc in AutoCAD."""
-        try:
-            center = specs["position"]["center_point"]
-            radius = specs["dimensions"].get("radius", 1.0)
-            start_angle = specs.get("start_angle", 0.0)
-            end_angle = specs.get("end_angle", 90.0)
-            
-            center_point = self._convert_to_3d_point(center)
-            
-            logger.info(f"Drawing arc at {center_point} with radius {radius}")
-            
-            # Create arc using AddArc method
-            # Convert center point to variant array
-            center_array = list(center_point)
-            arc = modelspace.AddArc(win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8, center_array), radius, start_angle, end_angle)
-            
-            logger.info("Successfully drew arc.")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to draw arc: {str(e)}")
-            return False
+        center = specs["position"]["center_point"]
+        radius = specs["dimensions"].get("radius", 1.0)
+        start_angle = specs.get("start_angle", 0.0)
+        end_angle = specs.get("end_angle", 90.0)
+        
+        center_point = self._convert_to_3d_point(center)
+        
+        logger.info(f"Drawing arc at {center_point} with radius {radius}")
+        
+        # Create arc using AddArc method
+        # Convert center point to variant array
+        center_array = center_point
+        arc = modelspace.AddArc(_VARIANT(_VT_R8_ARRAY, center_array), radius, start_angle, end_angle)
+        self._remember_object(arc)
+        
+        logger.info("Successfully drew arc.")
+        return True
 
+    @_autocad_op("draw ellipse")
     def _draw_ellipse(self, specs, modelspace):
         """Draw an ellipse in AutoCAD."""
-        try:
-            center = specs["position"]["center_point"]
-            major_axis = specs["dimensions"].get("major_axis", 2.0)
-            minor_axis = specs["dimensions"].get("minor_axis", 1.0)
-            
-            center_point = self._convert_to_3d_point(center)
-            
-            logger.info(f"Drawing ellipse at {center_point}")
-            
-            # Create ellipse using AddEllipse method
-            # Convert center point to variant array
-            center_array = list(center_point)
-            # For ellipse, we need to specify the major axis endpoint
-            major_axis_end = (center_point[0] + major_axis, center_point[1], center_point[2])
-            major_axis_array = list(major_axis_end)
-            
-            ellipse = modelspace.AddEllipse(win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8, center_array), 
-                                          win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8, major_axis_array), 
-                                          minor_axis / major_axis)
-            
-            logger.info("Successfully drew ellipse.")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to draw ellipse: {str(e)}")
-            return False
+        center = specs["position"]["center_point"]
+        major_axis = specs["dimensions"].get("major_axis", 2.0)
+        minor_axis = specs["dimensions"].get("minor_axis", 1.0)
+        
+        center_point = self._convert_to_3d_point(center)
+        
+        logger.info(f"Drawing ellipse at {center_point}")
+        
+        # Create ellipse using AddEllipse method
+        # Convert center point to variant array
+        center_array = center_point
+        # For ellipse, we need to specify the major axis endpoint
+        major_axis_end = (center_point[0] + major_axis, center_point[1], center_point[2])
+        major_axis_array = major_axis_end
+        
+        ellipse = modelspace.AddEllipse(_VARIANT(_VT_R8_ARRAY, center_array), 
+                                      _VARIANT(_VT_R8_ARRAY, major_axis_array), 
+                                      minor_axis / major_axis)
+        self._remember_object(ellipse)
+        
+        logger.info("Successfully drew ellipse.")
+        return True
 
+    @_autocad_op("add text")
     def _add_text(self, specs, modelspace):
         """Add text to AutoCAD drawing."""
-        try:
-            position = specs["position"]["insertion_point"]
-            text_content = specs.get("text_content", "Sample Text")
-            height = specs.get("text_height", 0.125)
-            
-            insertion_point = self._convert_to_3d_point(position)
-            
-            logger.info(f"Adding text '{text_content}' at {insertion_point}")
-            
-            # Create text using AddText method
-            # Convert insertion point to variant array
-            insertion_array = list(insertion_point)
-            text = modelspace.AddText(text_content, win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8, insertion_array), height)
-            
-            logger.info("Successfully added text.")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to add text: {str(e)}")
-            return False
+        position = specs["position"]["insertion_point"]
+        text_content = specs.get("text_content", "Sample Text")
+        height = specs.get("text_height", 0.125)
+        
+        insertion_point = self._convert_to_3d_point(position)
+        
+        logger.info(f"Adding text '{text_content}' at {insertion_point}")
+        
+        # Create text using AddText method
+        # Convert insertion point to variant array
+        insertion_array = insertion_point
+        text = modelspace.AddText(text_content, _VARIANT(_VT_R8_ARRAY, insertion_array), height)
+        self._remember_object(text)
+        
+        logger.info("Successfully added text.")
+        return True
 
+    @_autocad_op("add dimension")
     def _add_dimension(self, specs, modelspace):
         """Add dimension to AutoCAD drawing."""
-        try:
-            start_point = specs["position"]["start_point"]
-            end_point = specs["position"]["end_point"]
-            text_position = specs["position"]["text_position"]
-            
-            start_pt = self._convert_to_3d_point(start_point)
-            end_pt = self._convert_to_3d_point(end_point)
-            text_pt = self._convert_to_3d_point(text_position)
-            
-            logger.info(f"Adding dimension from {start_pt} to {end_pt}")
-            
-            # Create dimension using AddDimAligned method
-            modelspace.AddDimAligned(start_pt, end_pt, text_pt)
-            
-            logger.info("Successfully added dimension.")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to add dimension: {str(e)}")
-            return False
+        start_point = specs["position"]["start_point"]
+        end_point = specs["position"]["end_point"]
+        text_position = specs["position"]["text_position"]
+        
+        start_pt = self._convert_to_3d_point(start_point)
+        end_pt = self._convert_to_3d_point(end_point)
+        text_pt = self._convert_to_3d_point(text_position)
+        
+        logger.info(f"Adding dimension from {start_pt} to {end_pt}")
+        
+        # Create dimension using AddDimAligned method
+        dimension = modelspace.AddDimAligned(
+            self._to_variant_3d_point(start_pt),
+            self._to_variant_3d_point(end_pt),
+            self._to_variant_3d_point(text_pt),
+        )
+        self._remember_object(dimension)
+        
+        logger.info("Successfully added dimension.")
+        return True
 
+    @_autocad_op("add hatch")
     def _add_hatch(self, specs, modelspace):
         """Add hatch pattern to AutoCAD drawing."""
-        try:
-            pattern_name = specs.get("pattern_name", "SOLID")
-            scale = specs.get("scale", 1.0)
-            angle = specs.get("angle", 0.0)
-            
-            # Get the last created object to hatch
-            last_object = modelspace.Item(modelspace.Count - 1)
-            
-            logger.info(f"Adding hatch pattern '{pattern_name}'")
-            
-            # Create hatch using AddHatch method
-            hatch = modelspace.AddHatch(0, pattern_name, True)
-            hatch.AppendOuterLoop([last_object])
-            hatch.Evaluate()
-            
-            logger.info("Successfully added hatch.")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to add hatch: {str(e)}")
-            return False
+        pattern_name = specs.get("pattern_name", "SOLID")
+        scale = specs.get("scale", 1.0)
+        angle = specs.get("angle", 0.0)
+        
+        # Get the last created object to hatch
+        last_object = self._recent_object(modelspace)
+        
+        logger.info(f"Adding hatch pattern '{pattern_name}'")
+        
+        # Create hatch using AddHatch method
+        hatch = modelspace.AddHatch(0, pattern_name, True)
+        hatch.AppendOuterLoop([last_object])
+        hatch.Evaluate()
+        self._remember_object(hatch)
+        
+        logger.info("Successfully added hatch.")
+        return True
 
     def import_assets_as_blocks(self, assets_folder: str = None) -> Dict:
         """
@@ -662,32 +1148,55 @@ class AutoDrawAIAgent:
             autocad, doc, modelspace = self._get_autocad_objects()
             
             imported_blocks = {}
+            existing_blocks = {block.Name for block in doc.Blocks}
             
             # Find all .dwg files in the assets folder
-            for filename in os.listdir(assets_folder):
-                if filename.lower().endswith('.dwg'):
-                    file_path = os.path.join(assets_folder, filename)
-                    block_name = os.path.splitext(filename)[0]  # Remove .dwg extension
+            with os.scandir(assets_folder) as it:
+                dwg_entries = [e for e in it if e.is_file() and e.name.lower().endswith(_DWG_SUFFIX)]
+            
+            # Keep AutoCAD quiet while source drawings are opened and closed
+            cmdecho = doc.GetVariable("CMDECHO")
+            visible = autocad.Visible
+            doc.SetVariable("CMDECHO", 0)
+            autocad.Visible = False
+            
+            try:
+                for entry in dwg_entries:
+                    file_path = entry.path
+                    block_name = os.path.splitext(entry.name)[0]  # Remove .dwg extension
+                    
+                    if block_name in existing_blocks:
+                        imported_blocks[block_name] = file_path
+                        logger.info(f"Block already defined: {block_name}")
+                        continue
                     
+                    source_doc = None
                     try:
                         # Import the drawing as a block
-                        logger.info(f"Importing {filename} as block '{block_name}'")
+                        logger.info(f"Importing {entry.name} as block '{block_name}'")
                         
-                        # Use AutoCAD's InsertBlock method to import the drawing
-                        # This creates a block definition from the external drawing
-                        doc.InsertBlock(
-                            win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8, [0, 0, 0]),  # Insertion point
-                            file_path,  # File path
-                            1.0, 1.0, 1.0,  # Scale factors
-                            0.0  # Rotation
-                        )
+                        # Copy the source model space into a new block definition
+                        # in one CopyObjects call
+                        source_doc = autocad.Documents.Open(file_path, True)
+                        entities = list(source_doc.ModelSpace)
+                        block_def = doc.Blocks.Add(_ZERO_POINT, block_name)
+                        if entities:
+                            source_doc.CopyObjects(_VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_DISPATCH, entities), block_def)
                         
                         imported_blocks[block_name] = file_path
+                        existing_blocks.add(block_name)
                         logger.info(f"Successfully imported block: {block_name}")
                         
                     except Exception as e:
-                        logger.warning(f"Failed to import {filename}: {e}")
+                        logger.warning(f"Failed to import {entry.name}: {e}")
                         continue
+                    finally:
+                        if source_doc is not None:
+                            source_doc.Close(False)
+                            doc.Activate()
+            finally:
+                doc.SetVariable("CMDECHO", cmdecho)
+                autocad.Visible = visible
             
             logger.info(f"Imported {len(imported_blocks)} blocks from assets folder")
             return imported_blocks
@@ -707,8 +1216,7 @@ class AutoDrawAIAgent:
             autocad, doc, modelspace = self._get_autocad_objects()
             
             blocks = []
-            for i in range(doc.Blocks.Count):
-                block = doc.Blocks.Item(i)
+            for block in doc.Blocks:
                 if not block.IsLayout:  # Skip layout blocks
                     blocks.append(block.Name)
             
@@ -718,184 +1226,168 @@ class AutoDrawAIAgent:
             logger.error(f"Error listing blocks: {e}")
             return []
 
+    @_autocad_op("insert block")
     def _insert_block(self, specs, modelspace):
         """Insert a block in AutoCAD drawing."""
+        insertion_point = specs["position"]["insertion_point"]
+        block_name = specs.get("block_name", "test_block")
+        scale = specs.get("scale", 1.0)
+        rotation = specs.get("rotation", 0.0)
+        
+        insert_pt = self._convert_to_3d_point(insertion_point)
+        insert_var = self._to_variant_3d_point(insert_pt)
+        
+        logger.info(f"Inserting block '{block_name}' at {insert_pt}")
+        
+        # Get AutoCAD objects for current thread
+        autocad, doc, modelspace = self._get_autocad_objects()
+        
+        # Check if the block exists in the drawing
         try:
-            insertion_point = specs["position"]["insertion_point"]
-            block_name = specs.get("block_name", "test_block")
-            scale = specs.get("scale", 1.0)
-            rotation = specs.get("rotation", 0.0)
-            
-            insert_pt = self._convert_to_3d_point(insertion_point)
+            # Try to get the block definition
+            block_def = doc.Blocks.Item(block_name)
+            logger.info(f"Found existing block: {block_name}")
+            insert_name = block_name
+        except Exception as e:
+            logger.warning(f"Block '{block_name}' not found in drawing. Inserting a placeholder block instead.")
+            self._ensure_placeholder_block(doc)
+            insert_name = _PLACEHOLDER_BLOCK
+        
+        try:
+            # Create block reference using AddBlockReference method
+            block_ref = modelspace.AddBlockReference(insert_var, insert_name, scale, scale, scale, rotation)
+            self._remember_object(block_ref)
             
-            logger.info(f"Inserting block '{block_name}' at {insert_pt}")
+            # Apply rotation if specified
+            if rotation != 0.0:
+                block_ref.Rotation = math.radians(rotation)
             
-            # Get AutoCAD objects for current thread
-            autocad, doc, modelspace = self._get_autocad_objects()
+            # Label the placeholder with the block that was asked for
+            if insert_name == _PLACEHOLDER_BLOCK:
+                for attribute in block_ref.GetAttributes():
+                    attribute.TextString = block_name
             
-            # Check if the block exists in the drawing
-            try:
-                # Try to get the block definition
-                block_def = doc.Blocks.Item(block_name)
-                logger.info(f"Found existing block: {block_name}")
-            except Exception as e:
-                logger.warning(f"Block '{block_name}' not found in drawing. Creating a simple rectangle as placeholder.")
-                
-                # Create a simple rectangle as a placeholder block
-                # Define rectangle points (1x1 unit)
-                x, y, z = insert_pt
-                rect_points = [
-                    (x, y, z),           # Bottom-left
-                    (x + 1, y, z),       # Bottom-right
-                    (x + 1, y + 1, z),   # Top-right
-                    (x, y + 1, z),       # Top-left
-                    (x, y, z)            # Back to start to close
-                ]
-                
-                # Convert points to variant array
-                point_array = []
-                for point in rect_points:
-                    point_array.extend(point)
-                
-                # Create closed polyline for rectangle
-                polyline = modelspace.AddPolyline(win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8, point_array))
-                polyline.Closed = True
-                
-                # Add text label
-                text_point = (x + 0.5, y + 0.5, z)
-                text = modelspace.AddText(block_name, win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8, list(text_point)), 0.1)
-                
-                logger.info(f"Created placeholder block '{block_name}' as rectangle with label")
-                return True
+            logger.info("Successfully inserted block.")
+            return True
             
-            # If block exists, try to insert it
-            try:
-                # Create block reference using AddBlockReference method
-                block_ref = modelspace.AddBlockReference(insert_pt, block_name, scale, scale, scale, rotation)
-                
-                # Apply rotation if specified
-                if rotation != 0.0:
-                    block_ref.Rotation = rotation * (3.14159 / 180.0)  # Convert degrees to radians
-                
-                logger.info("Successfully inserted block.")
-                return True
-                
-            except Exception as e:
-                logger.error(f"Failed to insert block '{block_name}': {str(e)}")
-                logger.info("This might be due to the block not being properly defined or accessible.")
-                return False
-                
         except Exception as e:
-            logger.error(f"Failed to insert block: {str(e)}")
+            logger.error(f"Failed to insert block '{block_name}': {str(e)}")
+            logger.info("This might be due to the block not being properly defined or accessible.")
             return False
+            
 
+    def _ensure_placeholder_block(self, doc):
+        """
+        Define the placeholder block in doc if it is not there yet: a 1x1
+        rectangle with a NAME attribute at its centre.
+        """
+        try:
+            doc.Blocks.Item(_PLACEHOLDER_BLOCK)
+            return
+        except Exception:
+            pass
+        
+        block_def = doc.Blocks.Add(_ZERO_POINT, _PLACEHOLDER_BLOCK)
+        
+        # Define rectangle corners (1x1 unit) and close the polyline
+        polyline = block_def.AddLightWeightPolyline(_VARIANT(_VT_R8_ARRAY, array('d', (0, 0, 1, 0, 1, 1, 0, 1))))
+        polyline.Closed = True
+        
+        # Label, filled in per reference by _insert_block
+        block_def.AddAttribute(0.1, 0, "Block name", _VARIANT(_VT_R8_ARRAY, array('d', (0.5, 0.5, 0.0))), "NAME", "")
+        logger.info(f"Created placeholder block '{_PLACEHOLDER_BLOCK}'")
+    
+    @_autocad_op("create array")
     def _create_array(self, specs, modelspace):
         """Create an array of objects in AutoCAD."""
-        try:
-            array_type = specs.get("array_type", "rectangular")  # rectangular or polar
-            rows = specs.get("rows", 2)
-            columns = specs.get("columns", 2)
-            row_spacing = specs.get("row_spacing", 2.0)
-            column_spacing = specs.get("column_spacing", 2.0)
-            
-            # Get the last created object to array
-            last_object = modelspace.Item(modelspace.Count - 1)
-            
-            logger.info(f"Creating {array_type} array with {rows}x{columns} objects")
-            
-            if array_type == "rectangular":
-                # Create rectangular array
-                modelspace.AddRectangularArray(last_object, rows, columns, row_spacing, column_spacing)
-            else:
-                # Create polar array
-                center_point = specs["position"]["center_point"]
-                center_pt = self._convert_to_3d_point(center_point)
-                num_items = specs.get("num_items", 8)
-                angle = specs.get("angle", 360.0)
-                
-                modelspace.AddPolarArray(last_object, center_pt, num_items, angle)
-            
-            logger.info("Successfully created array.")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to create array: {str(e)}")
-            return False
+        array_type = specs.get("array_type", "rectangular")  # rectangular or polar
+        rows = specs.get("rows", 2)
+        columns = specs.get("columns", 2)
+        row_spacing = specs.get("row_spacing", 2.0)
+        column_spacing = specs.get("column_spacing", 2.0)
+        
+        # Get the last created object to array
+        last_object = self._recent_object(modelspace)
+        
+        logger.info(f"Creating {array_type} array with {rows}x{columns} objects")
+        
+        if array_type == "rectangular":
+            # Create rectangular array
+            modelspace.AddRectangularArray(last_object, rows, columns, row_spacing, column_spacing)
+        else:
+            # Create polar array
+            center_point = specs["position"]["center_point"]
+            center_pt = self._convert_to_3d_point(center_point)
+            num_items = specs.get("num_items", 8)
+            angle = specs.get("angle", 360.0)
+            
+            modelspace.AddPolarArray(last_object, self._to_variant_3d_point(center_pt), num_items, angle)
+        
+        logger.info("Successfully created array.")
+        return True
+
+    def _point_arg(self, point):
+        """Format a 3D point as command-line input."""
+        return ",".join(repr(float(c)) for c in point)
 
+    def _send_transform_command(self, command: str):
+        """Send a whole-drawing transform as a single command and wait for it."""
+        autocad, doc, modelspace = self._get_autocad_objects()
+        doc.SendCommand(command)
+        self._wait_for_command_completion()
+        # Commands can create entities this agent never saw
+        self._thread_local.recent_objects = None
+
+    @_autocad_op("mirror objects")
     def _mirror_objects(self, specs, modelspace):
         """Mirror objects in AutoCAD."""
-        try:
-            mirror_line_start = specs["position"]["mirror_line_start"]
-            mirror_line_end = specs["position"]["mirror_line_end"]
-            
-            start_pt = self._convert_to_3d_point(mirror_line_start)
-            end_pt = self._convert_to_3d_point(mirror_line_end)
-            
-            logger.info(f"Mirroring objects along line from {start_pt} to {end_pt}")
-            
-            # Get all objects in modelspace
-            objects = []
-            for i in range(modelspace.Count):
-                objects.append(modelspace.Item(i))
-            
-            # Mirror each object
-            for obj in objects:
-                modelspace.AddMirror(obj, start_pt, end_pt)
-            
-            logger.info("Successfully mirrored objects.")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to mirror objects: {str(e)}")
-            return False
+        mirror_line_start = specs["position"]["mirror_line_start"]
+        mirror_line_end = specs["position"]["mirror_line_end"]
+        
+        start_pt = self._convert_to_3d_point(mirror_line_start)
+        end_pt = self._convert_to_3d_point(mirror_line_end)
+        
+        logger.info(f"Mirroring objects along line from {start_pt} to {end_pt}")
+        
+        # Mirror everything in one command, keeping the source objects
+        self._send_transform_command(f"_.MIRROR\n{_ALL_OBJECTS}\n\n{self._point_arg(start_pt)}\n{self._point_arg(end_pt)}\nN\n")
+        
+        logger.info("Successfully mirrored objects.")
+        return True
 
+    @_autocad_op("rotate objects")
     def _rotate_objects(self, specs, modelspace):
         """Rotate objects in AutoCAD."""
-        try:
-            base_point = specs["position"]["base_point"]
-            angle = specs.get("angle", 90.0)
-            
-            base_pt = self._convert_to_3d_point(base_point)
-            
-            logger.info(f"Rotating objects around {base_pt} by {angle} degrees")
-            
-            # Get all objects in modelspace
-            objects = []
-            for i in range(modelspace.Count):
-                objects.append(modelspace.Item(i))
-            
-            # Rotate each object
-            for obj in objects:
-                modelspace.AddRotate(obj, base_pt, angle)
-            
-            logger.info("Successfully rotated objects.")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to rotate objects: {str(e)}")
-            return False
+        base_point = specs["position"]["base_point"]
+        # Convert before sending so a bad value never reaches the ROTATE prompt
+        angle = float(specs.get("angle", 90.0))
+        
+        base_pt = self._convert_to_3d_point(base_point)
+        
+        logger.info(f"Rotating objects around {base_pt} by {angle} degrees")
+        
+        # Rotate everything in one command
+        self._send_transform_command(f"_.ROTATE\n{_ALL_OBJECTS}\n\n{self._point_arg(base_pt)}\n{angle!r}\n")
+        
+        logger.info("Successfully rotated objects.")
+        return True
 
+    @_autocad_op("scale objects")
     def _scale_objects(self, specs, modelspace):
         """Scale objects in AutoCAD."""
-        try:
-            base_point = specs["position"]["base_point"]
-            scale_factor = specs.get("scale_factor", 2.0)
-            
-            base_pt = self._convert_to_3d_point(base_point)
-            
-            logger.info(f"Scaling objects from {base_pt} by factor {scale_factor}")
-            
-            # Get all objects in modelspace
-            objects = []
-            for i in range(modelspace.Count):
-                objects.append(modelspace.Item(i))
-            
-            # Scale each object
-            for obj in objects:
-                modelspace.AddScale(obj, base_pt, scale_factor)
-            
-            logger.info("Successfully scaled objects.")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to scale objects: {str(e)}")
-            return False
+        base_point = specs["position"]["base_point"]
+        # Convert before sending so a bad value never reaches the SCALE prompt
+        scale_factor = float(specs.get("scale_factor", 2.0))
+        
+        base_pt = self._convert_to_3d_point(base_point)
+        
+        logger.info(f"Scaling objects from {base_pt} by factor {scale_factor}")
+        
+        # Scale everything in one command
+        self._send_transform_command(f"_.SCALE\n{_ALL_OBJECTS}\n\n{self._point_arg(base_pt)}\n{scale_factor!r}\n")
+        
+        logger.info("Successfully scaled objects.")
+        return True
 
     def _modify_objects(self, specs, modelspace, command):
         """Modify existing objects in AutoCAD."""
@@ -903,7 +1395,7 @@ class AutoDrawAIAgent:
             if command == "offset":
                 distance = specs.get("offset_distance", 1.0)
                 # Get the last created object to offset
-                last_object = modelspace.Item(modelspace.Count - 1)
+                last_object = self._recent_object(modelspace)
                 modelspace.AddOffset(last_object, distance)
                 logger.info(f"Successfully offset object by {distance}")
                 
@@ -912,7 +1404,7 @@ class AutoDrawAIAgent:
                 cutting_edges = specs.get("cutting_edges", [])
                 if cutting_edges:
                     # Get objects to trim (last created object)
-                    last_object = modelspace.Item(modelspace.Count - 1)
+                    last_object = self._recent_object(modelspace)
                     modelspace.AddTrim(last_object, cutting_edges)
                     logger.info("Successfully trimmed object")
                     
@@ -921,16 +1413,16 @@ class AutoDrawAIAgent:
                 boundary = specs.get("boundary", [])
                 if boundary:
                     # Get objects to extend (last created object)
-                    last_object = modelspace.Item(modelspace.Count - 1)
+                    last_object = self._recent_object(modelspace)
                     modelspace.AddExtend(last_object, boundary)
                     logger.info("Successfully extended object")
                     
             elif command == "fillet":
                 radius = specs.get("fillet_radius", 0.5)
                 # Get the last two created objects to fillet
-                if modelspace.Count >= 2:
-                    obj1 = modelspace.Item(modelspace.Count - 2)
-                    obj2 = modelspace.Item(modelspace.Count - 1)
+                if self._recent_object_count() >= 2:
+                    obj1 = self._recent_object(modelspace, 2)
+                    obj2 = self._recent_object(modelspace)
                     modelspace.AddFillet(obj1, obj2, radius)
                     logger.info(f"Successfully created fillet with radius {radius}")
                     
@@ -938,9 +1430,9 @@ class AutoDrawAIAgent:
                 distance1 = specs.get("chamfer_distance1", 0.5)
                 distance2 = specs.get("chamfer_distance2", 0.5)
                 # Get the last two created objects to chamfer
-                if modelspace.Count >= 2:
-                    obj1 = modelspace.Item(modelspace.Count - 2)
-                    obj2 = modelspace.Item(modelspace.Count - 1)
+                if self._recent_object_count() >= 2:
+                    obj1 = self._recent_object(modelspace, 2)
+                    obj2 = self._recent_object(modelspace)
                     modelspace.AddChamfer(obj1, obj2, distance1, distance2)
                     logger.info(f"Successfully created chamfer with distances {distance1}, {distance2}")
             
@@ -949,38 +1441,61 @@ class AutoDrawAIAgent:
             logger.error(f"Failed to modify objects with {command}: {str(e)}")
             return False
 
+    @_autocad_op("repeat last command")
     def _repeat_last_command(self, specs, modelspace):
         """Repeat the last command executed."""
-        try:
-            # This would typically repeat the last command with new parameters
-            # For now, we'll just log that it was called
-            logger.info("Repeat last command called")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to repeat last command: {str(e)}")
-            return False
+        # This would typically repeat the last command with new parameters
+        # For now, we'll just log that it was called
+        logger.info("Repeat last command called")
+        return True
 
+    @_autocad_op("add text annotation")
     def _add_text_annotation(self, specs, modelspace):
         """Add text annotation to the drawing."""
-        try:
-            # Use the existing _add_text method
-            return self._add_text(specs, modelspace)
-        except Exception as e:
-            logger.error(f"Failed to add text annotation: {str(e)}")
-            return False
+        # Use the existing _add_text method
+        return self._add_text(specs, modelspace)
 
+    @_autocad_op("purge drawing")
     def _purge_drawing(self, doc):
         """Purge unused objects from the drawing."""
-        try:
-            # Execute purge command
-            doc.SendCommand("_PURGE ")
-            logger.info("Successfully purged drawing")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to purge drawing: {str(e)}")
-            return False
+        # Purge through Automation rather than the command line parser
+        doc.PurgeAll()
+        logger.info("Successfully purged drawing")
+        return True
 
-    def execute_drawing_command(self, specifications: Dict) -> bool:
+    def _build_command_dispatch(self) -> Dict:
+        """Map each drawing command to a handler taking (specifications, modelspace)."""
+        dispatch = {
+            "repeat_last": self._repeat_last_command,
+            # Uses the document cached for this thread by execute_drawing_command
+            "purge_all": lambda specs, modelspace: self._purge_drawing(self._thread_local.doc),
+            # New complex drawing commands
+            "rectangle": self._draw_rectangle,
+            "circle": self._draw_circle,
+            "polyline": self._draw_polyline,
+            "arc": self._draw_arc,
+            "ellipse": self._draw_ellipse,
+            "text": self._add_text,
+            "dimension": self._add_dimension,
+            "hatch": self._add_hatch,
+            "block": self._insert_block,
+            "array": self._create_array,
+            "mirror": self._mirror_objects,
+            "rotate": self._rotate_objects,
+            "scale": self._scale_objects,
+        }
+        for command in _LIGHTING_COMMANDS:
+            dispatch[command] = self._draw_lighting_fixture
+        for command in ["details", "output_modifier", "driver_calculator", "driver_update", "runid_update", "susp_kit_count", "ww_toggle"]:
+            dispatch[command] = self._add_text_annotation
+        for command in ["add_empck", "import_assets", "redefine_blocks"]:
+            dispatch[command] = self._insert_block
+        # These are modification commands that work on existing objects
+        for command in ["offset", "trim", "extend", "fillet", "chamfer"]:
+            dispatch[command] = functools.partial(self._modify_objects, command=command)
+        return dispatch
+    
+    def execute_drawing_command(self, specifications: Spec) -> bool:
         """
         Execute the AutoCAD drawing command based on parsed specifications.
 
@@ -992,63 +1507,29 @@ class AutoDrawAIAgent:
         """
         try:
             command = specifications.get('command')
-            if not command or command not in self.command_map:
-                logger.error(f"Invalid command: {command}")
+            
+            # One lookup resolves every command, including the grouped
+            # lighting, annotation, block and modify commands; command_map is
+            # only consulted to word the error
+            handler = self._command_dispatch.get(command)
+            if handler is None:
+                if not command or command not in self.command_map:
+                    logger.error(f"Invalid command: {command}")
+                else:
+                    logger.error(f"Unknown command type: {command}")
                 return False
 
-            # Get AutoCAD objects for current thread
-            autocad, doc, modelspace = self._get_autocad_objects()
+            # Get AutoCAD objects for current thread, checking the connection
+            # once per command
+            autocad, doc, modelspace = self._get_autocad_objects(verify=True)
 
-            # Execute based on command type
-            if command in ["linear_light", "linear_light_reflector", "rush_light", "rush_recessed", "pg_light", "magneto_track"]:
-                return self._draw_lighting_fixture(specifications, modelspace)
-            elif command == "repeat_last":
-                return self._repeat_last_command(specifications, modelspace)
-            elif command in ["details", "output_modifier", "driver_calculator", "driver_update", "runid_update", "susp_kit_count", "ww_toggle"]:
-                return self._add_text_annotation(specifications, modelspace)
-            elif command in ["add_empck", "import_assets", "redefine_blocks"]:
-                return self._insert_block(specifications, modelspace)
-            elif command == "purge_all":
-                return self._purge_drawing(doc)
-            # New complex drawing commands
-            elif command == "rectangle":
-                return self._draw_rectangle(specifications, modelspace)
-            elif command == "circle":
-                return self._draw_circle(specifications, modelspace)
-            elif command == "polyline":
-                return self._draw_polyline(specifications, modelspace)
-            elif command == "arc":
-                return self._draw_arc(specifications, modelspace)
-            elif command == "ellipse":
-                return self._draw_ellipse(specifications, modelspace)
-            elif command == "text":
-                return self._add_text(specifications, modelspace)
-            elif command == "dimension":
-                return self._add_dimension(specifications, modelspace)
-            elif command == "hatch":
-                return self._add_hatch(specifications, modelspace)
-            elif command == "block":
-                return self._insert_block(specifications, modelspace)
-            elif command == "array":
-                return self._create_array(specifications, modelspace)
-            elif command == "mirror":
-                return self._mirror_objects(specifications, modelspace)
-            elif command == "rotate":
-                return self._rotate_objects(specifications, modelspace)
-            elif command == "scale":
-                return self._scale_objects(specifications, modelspace)
-            elif command in ["offset", "trim", "extend", "fillet", "chamfer"]:
-                # These are modification commands that work on existing objects
-                return self._modify_objects(specifications, modelspace, command)
-            else:
-                logger.error(f"Unknown command type: {command}")
-                return False
+            return handler(specifications, modelspace)
 
         except Exception as e:
             logger.error(f"Error executing drawing command: {e}")
             return False
     
-    def _prepare_command_parameters(self, specifications: Dict) -> str:
+    def _prepare_command_parameters(self, specifications: Spec) -> str:
         """Prepare sanitized command parameters for AutoCAD execution."""
         params = []
 
@@ -1083,23 +1564,57 @@ class AutoDrawAIAgent:
 
         return " ".join(params)
     
+    def _document_events(self, doc):
+        """
+        Return this thread's EndCommand event sink for doc, or None if events
+        cannot be connected.
+        """
+        cached = getattr(self._thread_local, 'doc_events', None)
+        if cached is not None and cached[0] is doc:
+            return cached[1]
+        try:
+            sink = win32com.client.WithEvents(doc, _DocumentEvents)
+            sink.command_ended = threading.Event()
+        except Exception as e:
+            logger.debug(f"Document events unavailable, polling instead: {e}")
+            sink = None
+        self._thread_local.doc_events = (doc, sink)
+        return sink
+    
     def _wait_for_command_completion(self, timeout: int = 30):
         """Wait for AutoCAD command to complete."""
-        import time
         start_time = time.time()
         
+        # Get AutoCAD objects for current thread
+        autocad, doc, modelspace = self._get_autocad_objects()
+        events = self._document_events(doc)
+        
+        try:
+            if not doc.CommandInProgress:
+                return
+        except Exception as e:
+            logger.error(f"Error waiting for command completion: {e}")
+        if events is not None:
+            # Deliver EndCommand notifications of earlier commands first
+            pythoncom.PumpWaitingMessages()
+            events.command_ended.clear()
+        
+        # Back off from 5 ms to 100 ms. With events connected the loop only
+        # pumps messages until EndCommand fires, and asks AutoCAD directly
+        # once the delay is at its cap (covers cancelled commands)
+        delay = 0.005
         while time.time() - start_time < timeout:
             try:
-                # Get AutoCAD objects for current thread
-                autocad, doc, modelspace = self._get_autocad_objects()
-                
-                # Check if command is still running
-                if not doc.CommandInProgress:
+                if events is not None:
+                    pythoncom.PumpWaitingMessages()
+                    if events.command_ended.is_set():
+                        return
+                if (events is None or delay >= 0.1) and not doc.CommandInProgress:
                     return
-                time.sleep(0.1)
             except Exception as e:
                 logger.error(f"Error waiting for command completion: {e}")
-                time.sleep(0.1)
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
         
         logger.warning("Command execution timeout")
     
@@ -1128,12 +1643,14 @@ class AutoDrawAIAgent:
             if not self._validate_specifications(specifications):
                 return {"success": False, "error": "Invalid specifications"}
             
-            # Step 3: Execute drawing command
-            success = self.execute_drawing_command(specifications)
-            
-            # Step 4: Apply additional modifications if needed
-            if success and specifications.get('additional_parameters'):
-                self._apply_additional_modifications(specifications['additional_parameters'])
+            # Steps 3-4 run as one undo group with echo and auto-regen off
+            with self._drawing_operation():
+                # Step 3: Execute drawing command
+                success = self.execute_drawing_command(specifications)
+                
+                # Step 4: Apply additional modifications if needed
+                if success and specifications.get('additional_parameters'):
+                    self._apply_additional_modifications(specifications['additional_parameters'])
             
             # Step 5: Generate summary
             summary = self._generate_drawing_summary(specifications)
@@ -1149,7 +1666,36 @@ class AutoDrawAIAgent:
             logger.error(f"Error creating drawing: {e}")
             return {"success": False, "error": str(e)}
     
-    def _validate_specifications(self, specifications: Dict) -> bool:
+    @contextmanager
+    def _drawing_operation(self):
+        """
+        Group the enclosed drawing calls into one undo mark, with CMDECHO and
+        REGENMODE switched off and restored afterwards.
+        
+        Best effort: without an AutoCAD connection the body simply runs.
+        """
+        try:
+            autocad, doc, modelspace = self._get_autocad_objects()
+            saved = {name: doc.GetVariable(name) for name in ("CMDECHO", "REGENMODE")}
+            for name in saved:
+                doc.SetVariable(name, 0)
+            doc.StartUndoMark()
+        except Exception as e:
+            logger.debug(f"Drawing operation not grouped: {e}")
+            yield
+            return
+        
+        try:
+            yield
+        finally:
+            try:
+                doc.EndUndoMark()
+                for name, value in saved.items():
+                    doc.SetVariable(name, value)
+            except Exception as e:
+                logger.warning(f"Failed to restore drawing state: {e}")
+    
+    def _validate_specifications(self, specifications: Spec) -> bool:
         """Validate parsed specifications."""
         # Command is always required
         if 'command' not in specifications:
@@ -1161,8 +1707,7 @@ class AutoDrawAIAgent:
             return False
         
         # Lighting system is only required for lighting-related commands
-        lighting_commands = ["linear_light", "linear_light_reflector", "rush_light", "rush_recessed", "pg_light", "magneto_track"]
-        if specifications['command'] in lighting_commands:
+        if specifications['command'] in _LIGHTING_COMMANDS:
             if 'lighting_system' not in specifications:
                 logger.error(f"Missing required field: lighting_system for command {specifications['command']}")
                 return False
@@ -1178,6 +1723,7 @@ class AutoDrawAIAgent:
             # Apply emergency backup if specified
             if additional_params.get('emergency_backup') == 'true':
                 doc.SendCommand("_ADDEM ")
+                self._thread_local.recent_objects = None
             
             # Apply dimming if specified
             if additional_params.get('dimmable') == 'true':
@@ -1192,7 +1738,7 @@ class AutoDrawAIAgent:
         except Exception as e:
             logger.error(f"Error applying additional modifications: {e}")
     
-    def _generate_drawing_summary(self, specifications: Dict) -> str:
+    def _generate_drawing_summary(self, specifications: Spec) -> str:
         """Generate a summary of the created drawing."""
         summary = f"Created {specifications.get('lighting_system', 'lighting')} drawing:\n"
         
@@ -1208,28 +1754,114 @@ class AutoDrawAIAgent:
         
         return summary
     
-    def batch_process_requests(self, requests: List[str]) -> List[Dict]:
+    def batch_process_requests(self, requests: List[str], parse_workers: int = 4) -> List[Dict]:
         """
         Process multiple drawing requests in batch.
         
         Args:
-            requests: List of natural language drawing requests
+            requests: Natural language drawing requests or specifications dicts
+            parse_workers: Number of requests parsed concurrently
             
         Returns:
             List of execution results
         """
-        results = []
+        return list(self.batch_process_requests_iter(requests, parse_workers))
+    
+    def batch_process_requests_iter(self, requests: List[str], parse_workers: int = 4) -> Iterator[Dict]:
+        """
+        Process multiple drawing requests, yielding each result as it completes.
         
-        for i, request in enumerate(requests):
-            logger.info(f"Processing request {i+1}/{len(requests)}: {request}")
-            result = self.create_complete_drawing(request)
-            results.append(result)
+        Args:
+            requests: Natural language drawing requests or specifications dicts
+            parse_workers: Number of requests parsed concurrently
             
-            # Add delay between requests to prevent AutoCAD overload
-            import time
-            time.sleep(1)
+        Yields:
+            Execution result for each request, in order
+        """
+        # Parse on a producer thread while this thread, which owns the COM
+        # objects, draws the previous request
+        parsed = queue.Queue(maxsize=2)
+        stop = threading.Event()
+        aborted = object()
+        failure = []
         
-        return results
+        def produce():
+            try:
+                with ThreadPoolExecutor(max_workers=parse_workers, thread_name_prefix="batch-parse") as pool:
+                    # Each distinct prompt (ignoring whitespace) is parsed once, as
+                    # first written; repeats share its future. Anything else (a
+                    # specifications dict) is drawn as given
+                    futures = {}
+                    sources = []
+                    for request in requests:
+                        if isinstance(request, str):
+                            key = " ".join(request.split())
+                            if key not in futures:
+                                futures[key] = pool.submit(self.process_natural_language_request, request)
+                            request = futures[key]
+                        sources.append(request)
+                    try:
+                        feed(sources)
+                    finally:
+                        for future in futures.values():
+                            future.cancel()
+            except Exception as e:
+                # Never leave the consumer waiting on a dead producer
+                logger.error(f"Batch parsing stopped: {e}")
+                failure.append(e)
+                put(aborted)
+        
+        def put(item):
+            while not stop.is_set():
+                try:
+                    parsed.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def feed(sources):
+            for source in sources:
+                if isinstance(source, Future):
+                    try:
+                        # Copy so a caller mutating one result cannot affect a repeat
+                        source = json.loads(json.dumps(source.result()))
+                    except Exception as e:
+                        source = e
+                if not put(source):
+                    return
+        
+        producer = threading.Thread(target=produce, name="batch-parser", daemon=True)
+        producer.start()
+        
+        try:
+            for i, request in enumerate(requests):
+                logger.info(f"Processing request {i+1}/{len(requests)}: {request}")
+                specifications = parsed.get()
+                if specifications is aborted:
+                    error = str(failure[0])
+                    for _ in range(i, len(requests)):
+                        yield {"success": False, "error": error}
+                    return
+                if isinstance(specifications, Exception):
+                    logger.error(f"Error creating complete drawing: {specifications}")
+                    yield {"success": False, "error": str(specifications)}
+                    continue
+                
+                try:
+                    result = self.create_complete_drawing(specifications)
+                except Exception as e:
+                    logger.error(f"Error creating complete drawing: {e}")
+                    result = {"success": False, "error": str(e)}
+                yield result
+                
+                # Let AutoCAD finish before the next request instead of a fixed delay
+                try:
+                    self._wait_for_command_completion()
+                except Exception as e:
+                    logger.debug(f"Skipping command wait: {e}")
+        finally:
+            stop.set()
     
     def get_available_commands(self) -> Dict:
         """Get list of available AutoCAD commands."""
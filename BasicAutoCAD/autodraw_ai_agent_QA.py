@@ -10,17 +10,198 @@ import win32com.client
 import json
 import os
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, TypedDict
 from datetime import datetime
+from types import MappingProxyType
+from pathlib import PureWindowsPath
 import threading
 import pythoncom
+import pywintypes
 import traceback
 import time
+import uuid
+from itertools import product
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# PG parameters as passed to c:PGAutoAPI, in argument order; static typing only
+class PGParams(TypedDict):
+    series: str
+    mounting: str
+    output: str
+    regress: int
+    rft: float
+    rin: float
+    fc_tog: int
+    wtw_tog: int
+    dout_mod: Optional[float]
+    finish: str
+    ex_nom: str
+    breakdown: str
+    max_tog: int
+    max_section: Optional[float]
+    fix_num: str
+    fix_qty: int
+    fix_type: str
+    run_ident: str
+    start_x: float
+    start_y: float
+
+# Fixture type to LISP API function mapping
+FIXTURE_API_MAP = MappingProxyType({
+    "PG": "c:PGAutoAPI",
+    "LS": "c:LSAutoAPI",
+    "LSR": "c:LSRAutoAPI",
+    "Rush": "c:RushAutoAPI",
+    "Rush-Rec": "c:RushRecAutoAPI",
+    #"Magneto": "c:MagAutoAPI",
+    "MagTrk": "c:MagTrkAutoAPI",
+})
+
+# Supported fixture types with their valid options
+FIXTURE_CONFIGS = MappingProxyType({
+    "PG": {
+        "series": ["PG2", "PG4", "FLAWLESS.2", "FLAWLESS.4", "PF2", "PF4"],
+        "mounting": ["F", "NT", "T", "T15", "MW"],
+        "output": ["LOW", "MED", "HIGH", "LMFT", "WFT"],
+        "regress": [0, 1, 2, 3, 4],
+        "finish": ["White", "Black", "Silver", "CC"],
+    },
+    "LS": {
+        "series": ["LS1", "LS2", "LS3", "LS4"],
+        "mounting": ["AC", "SM", "WM", "F", "NT", "T", "T15"],
+        "output": ["LOW", "MED", "HIGH", "LMFT", "WFT"],
+        "config": ["DN", "UP", "UPDN"],
+        "finish": ["White", "Black", "Silver", "CC"],
+    },
+    "LSR": {
+        "series": ["LSR1", "LSR2", "LSR3", "LSR4"],
+        "mounting": ["F", "NT", "T", "T15", "PMF", "PMNT"],
+        "output": ["LOW", "MED", "HIGH", "LMFT", "WFT"],
+        "finish": ["White", "Black", "Silver", "CC"],
+    },
+    "Rush": {
+        "series": ["Rush"],
+        "mounting": ["AC", "SM", "WM"],
+        "output": ["LOW", "MED", "HIGH"],
+        "finish": ["White", "Black", "Silver", "CC"],
+    },
+    "Magneto": {
+        "series": ["Magneto"],
+        "mounting": ["Surface", "Recessed"],
+        "output": ["LOW", "MED", "HIGH"],
+    },
+    "MagTrk": {
+        "series": ["Mag", "MagRec"],
+        "mounting": ["AC", "SM", "NT", "T", "T15", "SG"],
+        "output_up": ["LOW", "MED", "HIGH", "LMFT", "WFT"],
+        "finish": ["White", "Black", "Silver", "CC"],
+    },
+})
+
+# Finish code mapping (input format -> LISP format)
+FINISH_MAP = MappingProxyType({
+    'WH': 'White', 'WHITE': 'White', 'W': 'White',
+    'BK': 'Black', 'BLACK': 'Black', 'BLK': 'Black',
+    'SL': 'Silver', 'SILVER': 'Silver', 'SV': 'Silver', 'SLV': 'Silver',
+    'CC': 'CC', 'CUSTOM': 'CC'
+})
+
+# FINISH_MAP extended with the spellings requests usually use (upper, lower and
+# title case, and the LISP names themselves), so those need no case folding
+_FINISH_LOOKUP = {
+    spelling: finish
+    for code, finish in FINISH_MAP.items()
+    for spelling in (code, code.lower(), code.title(), finish)
+}
+
+_FIXTURE_TYPES = frozenset(FIXTURE_API_MAP)
+
+# Required spec fields per fixture type, in the order they are reported
+_REQUIRED_FIELD_ORDER = {
+    "PG": ('series', 'mounting', 'output', 'regress', 'length_ft'),
+    "LS": ('series', 'mounting', 'output', 'config', 'length_ft'),
+    "LSR": ('series', 'mounting', 'output', 'length_ft'),
+    "Rush": ('series', 'mounting', 'output', 'length_ft'),
+    "Rush-Rec": ('series', 'mounting', 'output', 'length_ft'),
+    "Magneto": ('series', 'mounting', 'output', 'length_ft'),
+    "MagTrk": ('series', 'mounting', 'length_ft'),
+}
+_REQUIRED_FIELDS = {name: frozenset(fields) for name, fields in _REQUIRED_FIELD_ORDER.items()}
+
+# Fixture type spellings accepted in any letter case -> canonical name
+_NORMALIZE_FIXTURE_TYPE = {
+    "".join(spelling): name
+    for name in ("PG", "LS", "LSR")
+    for spelling in product(*((c.lower(), c) for c in name))
+}
+
+# Resolve AutoCAD's ProgID to its CLSID once instead of on every connection
+_ACAD_PROGID = "AutoCAD.Application"
+try:
+    _ACAD_CLSID = pythoncom.ProgIDToCLSID(_ACAD_PROGID)
+except pywintypes.com_error:
+    _ACAD_CLSID = None
+
+
+def _get_active_autocad():
+    """Return the running AutoCAD application, looked up by its cached CLSID."""
+    if _ACAD_CLSID is None:
+        return win32com.client.GetActiveObject(_ACAD_PROGID)
+    unknown = pythoncom.GetActiveObject(_ACAD_CLSID)
+    return win32com.client.Dispatch(unknown.QueryInterface(pythoncom.IID_IDispatch))
+
+
+def _early_bind(com_object):
+    """Wrap a COM object in its makepy-generated class, or return it unchanged."""
+    try:
+        return win32com.client.gencache.EnsureDispatch(com_object)
+    except Exception as e:
+        logger.debug(f"Early binding unavailable, using late binding: {e}")
+        return com_object
+
+# HRESULTs meaning the AutoCAD COM server is gone: RPC_E_DISCONNECTED,
+# RPC_S_SERVER_UNAVAILABLE, RPC_E_SERVERFAULT
+_DISCONNECTED_HRESULTS = frozenset({0x80010108, 0x800706BA, 0x80010105})
+
+# Seconds a LISP file's stat result is reused before checking the disk again
+_LISP_STAT_TTL = 1.0
+
+# Per-document token for the drawing caches. Names repeat (a new or reopened
+# drawing can be Drawing1.dwg again), but USERS1-5 are not saved with the DWG,
+# so a token only lives as long as that open document and its loaded LISP.
+_DOC_TOKEN_VAR = "USERS4"
+_DOC_TOKEN_TAG = "AUTODRAWQA:"
+
+# Per-thread AutoCAD connection (autocad, doc, modelspace), shared by every
+# agent in the process so a thread connects and initializes COM only once
+_TLS = threading.local()
+
+# (c:PGAutoAPI ...) call, filled from _map_pg_params output by
+# _build_pg_lisp_command; *_lisp fields are already LISP literals
+_PG_CMD_TEMPLATE = (
+    '(c:PGAutoAPI "{series}" "{mounting}" "{output}" {regress} {rft} {rin} '
+    '{fc_tog} {wtw_tog} {dout_mod_lisp} "{finish}" "{ex_nom}" "{breakdown}" '
+    '{max_tog} {max_section_lisp} "{fix_num}" {fix_qty} {fix_type_lisp} '
+    '{run_ident_lisp} {start_x} {start_y})\n'
+)
+
+
+def _num_or_nil(val) -> str:
+    """LISP literal for an optional number (bools become 1/0)."""
+    if val is None:
+        return 'nil'
+    if isinstance(val, bool):
+        return '1' if val else '0'
+    return str(val)
+
+
+def _str_or_nil(val) -> str:
+    """LISP literal for an optional string."""
+    return 'nil' if val is None else f'"{val}"'
+
 
 class AutoDrawAIAgent:
     """
@@ -30,6 +211,11 @@ class AutoDrawAIAgent:
     Supports fixture types: PG, LS, LSR, Rush, Magneto, and more.
     """
     
+    # Shared, read-only fixture tables
+    fixture_api_map = FIXTURE_API_MAP
+    fixture_configs = FIXTURE_CONFIGS
+    finish_map = FINISH_MAP
+    
     def __init__(self, initialize_autocad: bool = True):
         """
         Initialize the AutoDraw AI Agent.
@@ -41,16 +227,27 @@ class AutoDrawAIAgent:
 
         self.lisp_base_path = r"C:\Users\coronetastera\Documents\Lisp and Dialogue files\Lisp"
 
-        self._thread_local = threading.local()
+        self._thread_local = _TLS
 
         self._initialized_drawings = set()  # Track which drawings have been initialized
         
+        # Fixture type -> drawing method
+        self._draw_methods = {
+            "PG": self._draw_pg_fixture,
+            "LS": self._draw_ls_fixture,
+            "LSR": self._draw_lsr_fixture,
+            "Rush": self._draw_rush_fixture,
+            "Rush-Rec": self._draw_rush_rec_fixture,
+            #"Magneto": self._draw_magneto_fixture,
+            "MagTrk": self._draw_magtrk_fixture,
+        }
+        
         # LISP file configuration
         # self.lisp_base_path = lisp_base_path or self._get_default_lisp_path()
         self._setup_lisp_files()
         
-        # Track loaded LISP files
-        self._loaded_lisp = set()
+        # Track loaded LISP files: (document token, file key) -> file mtime
+        self._loaded_lisp: Dict[Tuple[str, str], float] = {}
         
         # Initialize AutoCAD connection
         if initialize_autocad:
@@ -64,7 +261,7 @@ class AutoDrawAIAgent:
         return os.path.join(current_dir, "LISP")
     
     def _setup_lisp_files(self):
-        """Setup LISP file paths and fixture configurations."""
+        """Setup LISP file paths and their load commands."""
         
         # LISP file paths 
         self.lisp_files = {
@@ -79,65 +276,13 @@ class AutoDrawAIAgent:
 
         }
         
-        # Fixture type to LISP API function mapping
-        self.fixture_api_map = {
-            "PG": "c:PGAutoAPI",
-            "LS": "c:LSAutoAPI",
-            "LSR": "c:LSRAutoAPI",
-            "Rush": "c:RushAutoAPI",
-            "Rush-Rec": "c:RushRecAutoAPI",
-            #"Magneto": "c:MagAutoAPI",
-            "MagTrk": "c:MagTrkAutoAPI",
+        # (load ...) command for each LISP file, built once
+        self._lisp_load_cmds = {
+            key: self._lisp_load_command(path) for key, path in self.lisp_files.items()
         }
         
-        # Supported fixture types with their valid options
-        self.fixture_configs = {
-            "PG": {
-                "series": ["PG2", "PG4", "FLAWLESS.2", "FLAWLESS.4", "PF2", "PF4"],
-                "mounting": ["F", "NT", "T", "T15", "MW"],
-                "output": ["LOW", "MED", "HIGH", "LMFT", "WFT"],
-                "regress": [0, 1, 2, 3, 4],
-                "finish": ["White", "Black", "Silver", "CC"],
-            },
-            "LS": {
-                "series": ["LS1", "LS2", "LS3", "LS4"],
-                "mounting": ["AC", "SM", "WM", "F", "NT", "T", "T15"],
-                "output": ["LOW", "MED", "HIGH", "LMFT", "WFT"],
-                "config": ["DN", "UP", "UPDN"],
-                "finish": ["White", "Black", "Silver", "CC"],
-            },
-            "LSR": {
-                "series": ["LSR1", "LSR2", "LSR3", "LSR4"],
-                "mounting": ["F", "NT", "T", "T15", "PMF", "PMNT"],
-                "output": ["LOW", "MED", "HIGH", "LMFT", "WFT"],
-                "finish": ["White", "Black", "Silver", "CC"],
-            },
-            "Rush": {
-                "series": ["Rush"],
-                "mounting": ["AC", "SM", "WM"],
-                "output": ["LOW", "MED", "HIGH"],
-                "finish": ["White", "Black", "Silver", "CC"],
-            },
-            "Magneto": {
-                "series": ["Magneto"],
-                "mounting": ["Surface", "Recessed"],
-                "output": ["LOW", "MED", "HIGH"],
-            },
-            "MagTrk": {
-                "series": ["Mag", "MagRec"],
-                "mounting": ["AC", "SM", "NT", "T", "T15", "SG"],
-                "output_up": ["LOW", "MED", "HIGH", "LMFT", "WFT"],
-                "finish": ["White", "Black", "Silver", "CC"],
-            },
-        }
-        
-        # Finish code mapping (input format -> LISP format)
-        self.finish_map = {
-            'WH': 'White', 'WHITE': 'White', 'W': 'White',
-            'BK': 'Black', 'BLACK': 'Black', 'BLK': 'Black',
-            'SL': 'Silver', 'SILVER': 'Silver', 'SV': 'Silver', 'SLV': 'Silver',
-            'CC': 'CC', 'CUSTOM': 'CC'
-        }
+        # file key -> (mtime or None if missing, monotonic time of the stat)
+        self._lisp_stats = {key: self._stat_lisp_file(path) for key, path in self.lisp_files.items()}
 
     # =========================================================================
     # AUTOCAD CONNECTION MANAGEMENT
@@ -145,20 +290,40 @@ class AutoDrawAIAgent:
     
     def _initialize_autocad_connection(self):
         """Initialize AutoCAD COM connection for the current thread."""
+        # Reuse a live connection another agent already made on this thread
+        autocad = getattr(self._thread_local, 'autocad', None)
+        if autocad is not None:
+            try:
+                autocad.Name
+                return
+            except Exception:
+                self._cleanup_autocad_connection()
+        
         try:
             pythoncom.CoInitialize()
             
             # Try to get existing AutoCAD instance first
             try:
-                self._thread_local.autocad = win32com.client.GetActiveObject("AutoCAD.Application")
+                self._thread_local.autocad = _get_active_autocad()
                 logger.info("Connected to existing AutoCAD instance")
-            except:
+            except (pywintypes.com_error, AttributeError):
                 self._thread_local.autocad = win32com.client.Dispatch("AutoCAD.Application")
                 logger.info("Created new AutoCAD instance")
             
-            # Wait for AutoCAD to initialize
-            import time
-            time.sleep(1.0)
+            # Early-bind so documents and their methods dispatch through the
+            # type library instead of name lookups
+            self._thread_local.autocad = _early_bind(self._thread_local.autocad)
+            
+            # Wait for AutoCAD to answer, backing off from 10 ms up to 2 seconds
+            deadline = time.time() + 2.0
+            delay = 0.01
+            while time.time() < deadline:
+                try:
+                    self._thread_local.autocad.Name
+                    break
+                except Exception:
+                    time.sleep(delay)
+                    delay = min(delay * 2, 0.2)
             
             # Verify connection
             try:
@@ -197,30 +362,47 @@ class AutoDrawAIAgent:
             logger.error(f"Failed to connect to AutoCAD: {e}")
             try:
                 pythoncom.CoUninitialize()
-            except:
+            except pywintypes.com_error:
                 pass
             raise
     
-    def _get_autocad_objects(self):
-        """Get AutoCAD objects for the current thread, reconnecting if necessary."""
+    def _get_autocad_objects(self, active: bool = False):
+        """
+        Get AutoCAD objects for the current thread, connecting if necessary.
+        
+        The cached objects are returned without touching AutoCAD. With
+        active=True the active document is fetched (one COM call) so public
+        operations follow the drawing the user has switched to; a failure
+        there reconnects.
+        """
         try:
-            if not hasattr(self._thread_local, 'autocad') or self._thread_local.autocad is None:
+            if getattr(self._thread_local, 'autocad', None) is None:
                 self._initialize_autocad_connection()
             
-            # Test the connection
-            try:
-                doc = self._thread_local.autocad.ActiveDocument
-                return self._thread_local.autocad, doc, self._thread_local.modelspace
-            except Exception as e:
-                logger.info(f"AutoCAD connection broken, reconnecting... Error: {e}")
-                self._cleanup_autocad_connection()
-                self._initialize_autocad_connection()
-                return self._thread_local.autocad, self._thread_local.doc, self._thread_local.modelspace
+            if active:
+                try:
+                    doc = self._thread_local.autocad.ActiveDocument
+                except Exception as e:
+                    logger.info(f"AutoCAD connection broken, reconnecting... Error: {e}")
+                    self._cleanup_autocad_connection()
+                    self._initialize_autocad_connection()
+                    doc = self._thread_local.doc
+                if doc != self._thread_local.doc:
+                    # Only replace the cached document when another drawing is
+                    # active, so its cached token (see _document_key) stays valid
+                    self._thread_local.doc = doc
+            
+            return self._thread_local.autocad, self._thread_local.doc, self._thread_local.modelspace
                 
         except Exception as e:
             logger.error(f"Failed to get AutoCAD objects: {e}")
             raise
     
+    def _invalidate_on_com_error(self, error: Exception):
+        """Drop this thread's connection after a COM failure so the next call reconnects."""
+        if isinstance(error, pywintypes.com_error):
+            self._cleanup_autocad_connection()
+    
     def _cleanup_autocad_connection(self):
         """Clean up AutoCAD connection for the current thread."""
         try:
@@ -228,64 +410,120 @@ class AutoDrawAIAgent:
                 self._thread_local.autocad = None
                 self._thread_local.doc = None
                 self._thread_local.modelspace = None
+            self._thread_local.send_command_dispid = None
+            self._thread_local.doc_token = None
             pythoncom.CoUninitialize()
         except Exception as e:
             logger.error(f"Error cleaning up AutoCAD connection: {e}")
 
+    def _send_command(self, doc, command: str):
+        """
+        Send a command string to the document's command line.
+        
+        Calls IDispatch::Invoke with a DISPID looked up once per thread, rather
+        than letting doc.SendCommand resolve the name on every call.
+        """
+        dispid = getattr(self._thread_local, 'send_command_dispid', None)
+        if dispid is None:
+            dispid = doc._oleobj_.GetIDsOfNames(0, "SendCommand")
+            self._thread_local.send_command_dispid = dispid
+        doc._oleobj_.Invoke(dispid, 0, pythoncom.DISPATCH_METHOD, False, command)
+
     # =========================================================================
     # LISP FILE MANAGEMENT
     # =========================================================================
     
-    def _load_lisp_file(self, file_key: str) -> bool:
+    def _load_lisp_file(self, file_key: str, doc=None) -> bool:
         """
-        Load a LISP file if not already loaded.
+        Load a LISP file into a drawing unless it is already loaded there.
+        
+        A file is reloaded when the drawing changes or when the file has
+        been modified on disk since it was last loaded.
         
         Args:
             file_key: Key from self.lisp_files dictionary
+            doc: Document to load into (default: the active document)
             
         Returns:
             True if successful, False otherwise
         """
-        if file_key in self._loaded_lisp:
-            logger.debug(f"LISP file already loaded: {file_key}")
-            return True
-        
         if file_key not in self.lisp_files:
             logger.error(f"Unknown LISP file key: {file_key}")
             return False
         
         file_path = self.lisp_files[file_key]
         
-        # Check if file exists
-        if not os.path.exists(file_path):
+        # Check if file exists, reusing a recent stat
+        mtime, checked_at = self._lisp_stats[file_key]
+        if time.monotonic() - checked_at > _LISP_STAT_TTL:
+            mtime, checked_at = self._lisp_stats[file_key] = self._stat_lisp_file(file_path)
+        if mtime is None:
             logger.error(f"LISP file not found: {file_path}")
             return False
         
         try:
-            autocad, doc, modelspace = self._get_autocad_objects()
+            if doc is None:
+                autocad, doc, modelspace = self._get_autocad_objects()
             
-            # Normalize path for LISP (use forward slashes)
-            lisp_path = file_path.replace('\\', '/')
+            cache_key = (self._document_key(doc), file_key)
+            if self._loaded_lisp.get(cache_key) == mtime:
+                logger.debug("LISP file already loaded: %s", file_key)
+                return True
             
             # Load the LISP file
-            load_cmd = f'(load "{lisp_path}")\n'
-            doc.SendCommand(load_cmd)
+            self._send_command(doc, self._lisp_load_cmds[file_key])
             
-            self._loaded_lisp.add(file_key)
-            logger.info(f"Loaded LISP file: {file_path}")
+            self._loaded_lisp[cache_key] = mtime
+            logger.info("Loaded LISP file: %s", file_path)
             return True
             
         except Exception as e:
             logger.error(f"Failed to load LISP file {file_key}: {e}")
             return False
     
-    def _ensure_lisp_loaded(self, fixture_type: str) -> bool:
+    def _document_key(self, doc) -> str:
+        """
+        Identify an open document for _loaded_lisp and _initialized_drawings.
+        
+        Reads the document's token, tagging it with a new one first if it has
+        none (a document this agent has not seen in its current session). The
+        token of this thread's current document is cached, so repeat calls for
+        it make no COM calls.
+        """
+        cached = getattr(self._thread_local, 'doc_token', None)
+        if cached is not None and cached[0] is doc:
+            return cached[1]
+        try:
+            token = doc.GetVariable(_DOC_TOKEN_VAR)
+        except pywintypes.com_error:
+            token = None
+        if not (isinstance(token, str) and token.startswith(_DOC_TOKEN_TAG)):
+            token = _DOC_TOKEN_TAG + uuid.uuid4().hex
+            doc.SetVariable(_DOC_TOKEN_VAR, token)
+        self._thread_local.doc_token = (doc, token)
+        return token
+    
+    @staticmethod
+    def _stat_lisp_file(file_path: str) -> Tuple[Optional[float], float]:
+        """Return (mtime, or None if the file is missing; time of the check)."""
+        try:
+            mtime = os.path.getmtime(file_path)
+        except OSError:
+            mtime = None
+        return mtime, time.monotonic()
+    
+    @staticmethod
+    def _lisp_load_command(file_path: str) -> str:
+        """Build the (load ...) command for a LISP file (LISP wants forward slashes)."""
+        lisp_path = PureWindowsPath(file_path).as_posix()
+        return f'(load "{lisp_path}")\n'
+    
+    def _ensure_lisp_loaded(self, fixture_type: str, doc=None) -> bool:
         """
-        Ensure required LISP files are loaded.
-        Always reloads to handle new drawings.
+        Ensure the universal and fixture-specific LISP files are loaded
+        into the drawing.
         """
-        # Always load universal functions (safe to reload)
-        if not self._load_lisp_file_always("universal"):
+        if not self._load_lisp_file("universal", doc):
             logger.error("Failed to load universal LISP functions")
             return False
         
@@ -294,35 +532,12 @@ class AutoDrawAIAgent:
             logger.error(f"No LISP file configured for fixture type: {fixture_type}")
             return False
         
-        if not self._load_lisp_file_always(fixture_type):
+        if not self._load_lisp_file(fixture_type, doc):
             logger.error(f"Failed to load LISP file for fixture type: {fixture_type}")
             return False
         
         return True
     
-    def _load_lisp_file_always(self, file_key: str) -> bool:
-        """Load a LISP file (always reloads, doesn't check cache)."""
-        if file_key not in self.lisp_files:
-            logger.error(f"Unknown LISP file key: {file_key}")
-            return False
-        
-        file_path = self.lisp_files[file_key]
-        
-        if not os.path.exists(file_path):
-            logger.error(f"LISP file not found: {file_path}")
-            return False
-        
-        try:
-            autocad, doc, modelspace = self._get_autocad_objects()
-            lisp_path = file_path.replace('\\', '/')
-            load_cmd = f'(load "{lisp_path}")\n'
-            doc.SendCommand(load_cmd)
-            logger.info(f"Loaded LISP file: {file_path}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to load LISP file {file_key}: {e}")
-            return False
-    
     def set_lisp_path(self, fixture_type: str, path: str):
         """
         Set or update the path for a LISP file.
@@ -332,8 +547,11 @@ class AutoDrawAIAgent:
             path: Full path to the LISP file
         """
         self.lisp_files[fixture_type] = path
-        # Remove from loaded set so it gets reloaded with new path
-        self._loaded_lisp.discard(fixture_type)
+        self._lisp_load_cmds[fixture_type] = self._lisp_load_command(path)
+        self._lisp_stats[fixture_type] = self._stat_lisp_file(path)
+        # Forget it in every drawing so it gets reloaded with new path
+        for cache_key in [k for k in self._loaded_lisp if k[1] == fixture_type]:
+            del self._loaded_lisp[cache_key]
         logger.info(f"Updated LISP path for {fixture_type}: {path}")
 
     # =========================================================================
@@ -354,10 +572,10 @@ class AutoDrawAIAgent:
         """
         try:
             # Normalize fixture type
-            fixture_type = fixture_type.upper() if fixture_type.upper() in ["PG", "LS", "LSR"] else fixture_type
+            fixture_type = _NORMALIZE_FIXTURE_TYPE.get(fixture_type, fixture_type)
             
             # Validate fixture type
-            if fixture_type not in self.fixture_api_map:
+            if fixture_type not in _FIXTURE_TYPES:
                 return {
                     "success": False,
                     "error": f"Unknown fixture type: {fixture_type}. "
@@ -369,18 +587,9 @@ class AutoDrawAIAgent:
             #    return {"success": False, "error": f"Failed to load LISP files for {fixture_type}"}
             
             # Route to fixture-specific method
-            draw_methods = {
-                "PG": self._draw_pg_fixture,
-                "LS": self._draw_ls_fixture,
-                "LSR": self._draw_lsr_fixture,
-                "Rush": self._draw_rush_fixture,
-                "Rush-Rec": self._draw_rush_rec_fixture,
-                #"Magneto": self._draw_magneto_fixture,
-                "MagTrk": self._draw_magtrk_fixture,
-            }
-            
-            if fixture_type in draw_methods:
-                return draw_methods[fixture_type](specs)
+            draw_method = self._draw_methods.get(fixture_type)
+            if draw_method is not None:
+                return draw_method(specs)
             else:
                 return {"success": False, "error": f"No handler implemented for: {fixture_type}"}
                 
@@ -423,26 +632,32 @@ class AutoDrawAIAgent:
     
     def _map_finish(self, finish_input: str) -> str:
         """Map various finish input formats to LISP-expected format."""
-        if finish_input is None:
+        if isinstance(finish_input, str):
+            finish = _FINISH_LOOKUP.get(finish_input)
+            if finish is not None:
+                return finish
+        elif finish_input is None:
             return 'White'
         raw = str(finish_input).upper()
         return self.finish_map.get(raw, 'White')
     
-    def _validate_required_fields(self, specs: Dict, required: List[str]) -> Optional[str]:
+    def _validate_required_fields(self, specs: Dict, fixture_type: str) -> Optional[str]:
         """
         Validate that required fields are present in specs.
         
         Args:
             specs: Specifications dictionary
-            required: List of required field names
+            fixture_type: Canonical fixture type whose required fields apply
             
         Returns:
             Error message if validation fails, None if valid
         """
-        for field in required:
-            if field not in specs:
-                return f"Missing required field: {field}"
-        return None
+        missing = _REQUIRED_FIELDS[fixture_type].difference(specs)
+        if not missing:
+            return None
+        # Report the first missing field in declaration order
+        field = next(f for f in _REQUIRED_FIELD_ORDER[fixture_type] if f in missing)
+        return f"Missing required field: {field}"
 
     # =========================================================================
     # PG FIXTURE DRAWING
@@ -474,81 +689,97 @@ class AutoDrawAIAgent:
             - run_id: Run identifier string
             - start_x, start_y: Starting coordinates (default: 0, 0)
         """
-        try:
-
-            # Handle if specs is passed as JSON string
-            if isinstance(specs, str):
-                specs = json.loads(specs)
+        return self._draw_pg_fixtures([specs])[0]
+    
+    def _draw_pg_fixtures(self, specs_list: List[Dict]) -> List[Dict]:
+        """
+        Draw several PG fixtures with a single LISP send.
+        
+        Each spec is validated and mapped on its own; the commands for all
+        valid specs are then sent to AutoCAD together and waited on once.
+        
+        Args:
+            specs_list: PG specifications, as accepted by _draw_pg_fixture
+        
+        Returns:
+            One result dictionary per spec, in the same order
+        """
+        results = [None] * len(specs_list)
+        commands = []
+        drawn = []
+        
+        for i, specs in enumerate(specs_list):
+            try:
+                # Handle if specs is passed as JSON string
+                if isinstance(specs, str):
+                    specs = json.loads(specs)
 
-            # Validate required fields
-            required = ['series', 'mounting', 'output', 'regress', 'length_ft']
-            error = self._validate_required_fields(specs, required)
-            if error:
-                return {"success": False, "error": error}
-            
-            # Map specifications to LISP parameters
-            params = self._map_pg_params(specs)
-            
-            # Build and execute LISP command
-            lisp_cmd = self._build_pg_lisp_command(params)
-            
-            autocad, doc, modelspace = self._get_autocad_objects()
+                # Validate required fields
+                error = self._validate_required_fields(specs, "PG")
+                if error:
+                    results[i] = {"success": False, "error": error}
+                    continue
+                
+                # Map specifications to LISP parameters and build the command
+                params = self._map_pg_params(specs)
+                commands.append(self._build_pg_lisp_command(params))
+                drawn.append((i, params))
+            except Exception as e:
+                logger.error(f"Failed to draw PG fixture: {e}")
+                results[i] = {"success": False, "error": str(e)}
+        
+        if not commands:
+            return results
+        
+        try:
+            autocad, doc, modelspace = self._get_autocad_objects(active=True)
 
             # Store current document name BEFORE initialization
             current_doc_name = doc.Name
-            logger.info(f"Working in document: {current_doc_name}")
+            logger.info("Working in document: %s", current_doc_name)
             
             # Initialize drawing ONLY if not already done
-            if current_doc_name not in self._initialized_drawings:
+            if self._document_key(doc) not in self._initialized_drawings:
                 self._initialize_drawing_for_fixtures(doc, "PG")
             else:
-                # Just load the fixture LISP (it might have been unloaded)
-                fixture_path = self.lisp_files.get("MagTrk", "").replace('\\', '/')
-                doc.SendCommand(f'(load "{fixture_path}")\n')
-                time.sleep(1)
-
-            # DEBUG: Print the exact command
-            print("=" * 70)
-            print("PG LISP COMMAND:")
-            print(lisp_cmd)
-            print("=" * 70)
-            
-            
-            # DEBUG: Print document name
-            print(f"Active Document: {doc.Name}")
+                # Load the fixture LISP unless this drawing already has it
+                self._load_lisp_file("PG", doc)
 
-            # Initialize drawing if needed (for fresh drawings)
-            #self._initialize_drawing_for_fixtures(doc, "PG")
-
-            logger.info(f"Executing PG LISP command")
-
-            logger.debug(f"Command: {lisp_cmd}")
+            logger.info("Executing %d PG LISP command(s)", len(commands))
             
-            doc.SendCommand(lisp_cmd)
-
-            # time.sleep(2)
+            self._send_command(doc, "".join(commands))
 
             # Wait for command to complete
-            self._wait_for_autocad(doc)
-
-            #doc.SendCommand("nil")
+            if not self._wait_for_autocad(doc):
+                raise RuntimeError("AutoCAD did not finish the PG command(s) within the timeout")
             
-            return {
-                "success": True,
-                "message": "PG fixture drawn successfully",
-                "fixture_type": "PG",
-                "params": params,
-                "timestamp": datetime.now().isoformat()
-            }
+            timestamp = datetime.now().isoformat()
+            for i, params in drawn:
+                results[i] = {
+                    "success": True,
+                    "message": "PG fixture drawn successfully",
+                    "fixture_type": "PG",
+                    "params": params,
+                    "timestamp": timestamp
+                }
             
         except Exception as e:
             logger.error(f"Failed to draw PG fixture: {e}")
             logger.error(traceback.format_exc())
-            return {"success": False, "error": str(e)}
+            self._invalidate_on_com_error(e)
+            for i, params in drawn:
+                results[i] = {"success": False, "error": str(e)}
         
+        return results
+
 
     def _wait_for_autocad(self, doc, timeout: int = 30):
-        """Wait for AutoCAD to finish processing commands."""
+        """
+        Wait for AutoCAD to finish processing commands.
+        
+        Returns False if the commands are still running after timeout.
+        Re-raises the COM error if AutoCAD has disconnected.
+        """
         
         start_time = time.time()
         while time.time() - start_time < timeout:
@@ -556,23 +787,23 @@ class AutoDrawAIAgent:
                 # Check if command is still active
                 cmd_active = doc.GetVariable("CMDACTIVE")
                 if cmd_active == 0:
-                    # Command finished, wait a tiny bit more for safety
-                    time.sleep(0.3)
                     return True
-            except:
-                # If we can't check, just wait
-                pass
-            time.sleep(0.3)
+            except pywintypes.com_error as e:
+                # Calls are rejected while AutoCAD is busy drawing; only stop
+                # waiting if the server itself is gone
+                if (e.hresult & 0xFFFFFFFF) in _DISCONNECTED_HRESULTS:
+                    raise
+            time.sleep(0.02)
         
         logger.warning("AutoCAD command may not have completed within timeout")
         return False
         
 
     
-    def _map_pg_params(self, specs: Dict) -> Dict:
-        """Map input specs to PG LISP parameters."""
-        breakdown = specs.get('breakdown', 'EqualLength')
-        max_tog = 1 if breakdown == 'MaxSection' else 0
+    def _map_pg_params(self, specs: Dict) -> PGParams:
+        """Map input specs to PG LISP parameters (required fields already validated)."""
+        get = specs.get
+        breakdown = get('breakdown', 'EqualLength')
         
         return {
             'series': specs['series'],
@@ -580,55 +811,33 @@ class AutoDrawAIAgent:
             'output': specs['output'],
             'regress': int(specs['regress']),
             'rft': float(specs['length_ft']),
-            'rin': float(specs.get('length_in', 0)),
-            'fc_tog': 1 if specs.get('flush_ceiling') else 0,
-            'wtw_tog': 1 if specs.get('wall_to_wall') else 0,
-            'dout_mod': specs.get('custom_output'),
-            'finish': self._map_finish(specs.get('finish', 'White')),
-            'ex_nom': specs.get('oa_option', 'Exact'),
+            'rin': float(get('length_in', 0)),
+            'fc_tog': 1 if get('flush_ceiling') else 0,
+            'wtw_tog': 1 if get('wall_to_wall') else 0,
+            'dout_mod': get('custom_output'),
+            'finish': self._map_finish(get('finish', 'White')),
+            'ex_nom': get('oa_option', 'Exact'),
             'breakdown': breakdown,
-            'max_tog': max_tog,
-            'max_section': specs.get('max_section'),
-            'fix_num': specs.get('fixture_num', 'F1'),
-            'fix_qty': int(specs.get('quantity', 1)),
-            'fix_type': specs.get('fixture_type', ''),
-            'run_ident': specs.get('run_id', ''),
-            'start_x': float(specs.get('start_x', 0)),
-            'start_y': float(specs.get('start_y', 0)),
+            'max_tog': 1 if breakdown == 'MaxSection' else 0,
+            'max_section': get('max_section'),
+            'fix_num': get('fixture_num', 'F1'),
+            'fix_qty': int(get('quantity', 1)),
+            'fix_type': get('fixture_type', ''),
+            'run_ident': get('run_id', ''),
+            'start_x': float(get('start_x', 0)),
+            'start_y': float(get('start_y', 0)),
         }
     
-    def _build_pg_lisp_command(self, params: Dict) -> str:
+    def _build_pg_lisp_command(self, params: PGParams) -> str:
         """Build LISP command string for PG fixture."""
-        cmd = (
-            f'(c:PGAutoAPI '
-            f'"{params["series"]}" '
-            f'"{params["mounting"]}" '
-            f'"{params["output"]}" '
-            f'{params["regress"]} '
-            f'{params["rft"]} '
-            f'{params["rin"]} '
-            f'{params["fc_tog"]} '
-            f'{params["wtw_tog"]} '
-            f'{self._to_lisp_value(params["dout_mod"])} '
-            f'"{params["finish"]}" '
-            f'"{params["ex_nom"]}" '
-            f'"{params["breakdown"]}" '
-            f'{params["max_tog"]} '
-            f'{self._to_lisp_value(params["max_section"])} '
-            f'"{params["fix_num"]}" '
-            f'{params["fix_qty"]} '
-            f'{self._to_lisp_value(params["fix_type"], True)} '
-            f'{self._to_lisp_value(params["run_ident"], True)} '
-            f'{params["start_x"]} '
-            f'{params["start_y"]}'
-            f')\n'
+        cmd = _PG_CMD_TEMPLATE.format(
+            dout_mod_lisp=_num_or_nil(params["dout_mod"]),
+            max_section_lisp=_num_or_nil(params["max_section"]),
+            fix_type_lisp=_str_or_nil(params["fix_type"]),
+            run_ident_lisp=_str_or_nil(params["run_ident"]),
+            **params
         )
-
-        print("=" * 70)
-        print("LISP COMMAND BEING SENT:")
-        print(cmd)
-        print("=" * 70) 
-    
+        logger.debug("LISP command being sent: %s", cmd)
         return cmd
 
     # =========================================================================
@@ -661,56 +870,42 @@ class AutoDrawAIAgent:
             - start_x, start_y: Starting coordinates (default: 0, 0)
         """
         try:
-            import time
-            
             if isinstance(specs, str):
-                import json
                 specs = json.loads(specs)
             
-            required = ['series', 'mounting', 'length_ft']
-            error = self._validate_required_fields(specs, required)
+            error = self._validate_required_fields(specs, "MagTrk")
             if error:
                 return {"success": False, "error": error}
             
             params = self._map_magtrk_params(specs)
             lisp_cmd = self._build_magtrk_lisp_command(params)
 
-            autocad, doc, modelspace = self._get_autocad_objects()
+            autocad, doc, modelspace = self._get_autocad_objects(active=True)
 
             # Store current document name BEFORE initialization
             current_doc_name = doc.Name
-            logger.info(f"Working in document: {current_doc_name}")
+            logger.info("Working in document: %s", current_doc_name)
 
             # Initialize drawing ONLY if not already done
-            if current_doc_name not in self._initialized_drawings:
+            if self._document_key(doc) not in self._initialized_drawings:
                 self._initialize_drawing_for_fixtures(doc, "MagTrk")
             else:
-                # Just load the fixture LISP (it might have been unloaded)
-                fixture_path = self.lisp_files.get("MagTrk", "").replace('\\', '/')
-                doc.SendCommand(f'(load "{fixture_path}")\n')
-                time.sleep(1)  # Give time to load
+                # Load the fixture LISP unless this drawing already has it
+                self._load_lisp_file("MagTrk", doc)
 
             
-            # DEBUG: Print the exact command
-            print("=" * 70)
-            print("MAGTRK LISP COMMAND:")
-            print(lisp_cmd)
-            print("=" * 70)
-            
-            
-            
-            # DEBUG: Print document name
-            print(f"Active Document: {doc.Name}")
+            # DEBUG: Log the exact command
+            logger.debug("MagTrk LISP command: %s", lisp_cmd)
 
             # Initialize drawing if needed (for fresh drawings)
             #self._initialize_drawing_for_fixtures(doc, "MagTrk")
             
-            logger.info(f"Executing MagTrk LISP command")
+            logger.info("Executing MagTrk LISP command")
 
             # Send the main command (with just ONE newline)
             #doc.SendCommand(lisp_cmd.rstrip() + '\n')
             
-            doc.SendCommand(lisp_cmd)
+            self._send_command(doc, lisp_cmd)
             #doc.SendCommand('\n')  # Send Enter key to handle any waiting prompts
             
             # Wait for command to complete
@@ -732,6 +927,7 @@ class AutoDrawAIAgent:
         except Exception as e:
             logger.error(f"Failed to draw MagTrk fixture: {e}")
             logger.error(traceback.format_exc())
+            self._invalidate_on_com_error(e)
             return {"success": False, "error": str(e)}
         
         
@@ -804,8 +1000,7 @@ class AutoDrawAIAgent:
         Required specs will include: series, mounting, output, config, length_ft, etc.
         """
         # Validate required fields
-        required = ['series', 'mounting', 'output', 'config', 'length_ft']
-        error = self._validate_required_fields(specs, required)
+        error = self._validate_required_fields(specs, "LS")
         if error:
             return {"success": False, "error": error}
         
@@ -828,8 +1023,7 @@ class AutoDrawAIAgent:
         
         TODO: Implement when LSR_AutoDraw.lsp API function is created.
         """
-        required = ['series', 'mounting', 'output', 'length_ft']
-        error = self._validate_required_fields(specs, required)
+        error = self._validate_required_fields(specs, "LSR")
         if error:
             return {"success": False, "error": error}
         
@@ -849,8 +1043,7 @@ class AutoDrawAIAgent:
         
         TODO: Implement when Rush_AutoDraw.lsp API function is created.
         """
-        required = ['series', 'mounting', 'output', 'length_ft']
-        error = self._validate_required_fields(specs, required)
+        error = self._validate_required_fields(specs, "Rush")
         if error:
             return {"success": False, "error": error}
         
@@ -866,8 +1059,7 @@ class AutoDrawAIAgent:
         
         TODO: Implement when Rush_AutoDraw.lsp API function is created.
         """
-        required = ['series', 'mounting', 'output', 'length_ft']
-        error = self._validate_required_fields(specs, required)
+        error = self._validate_required_fields(specs, "Rush-Rec")
         if error:
             return {"success": False, "error": error}
         
@@ -887,8 +1079,7 @@ class AutoDrawAIAgent:
         
         TODO: Implement when Magneto_AutoDraw.lsp API function is created.
         """
-        required = ['series', 'mounting', 'output', 'length_ft']
-        error = self._validate_required_fields(specs, required)
+        error = self._validate_required_fields(specs, "Magneto")
         if error:
             return {"success": False, "error": error}
         
@@ -917,60 +1108,52 @@ class AutoDrawAIAgent:
         Returns:
             True if initialization successful, False otherwise
         """
-        import time
-        
         try:
             # Check if this drawing was already initialized
             drawing_name = doc.Name
-            if drawing_name in self._initialized_drawings:
+            drawing_key = self._document_key(doc)
+            if drawing_key in self._initialized_drawings:
                 logger.info(f"Drawing '{drawing_name}' already initialized, skipping")
                 return True
             
             logger.info(f"Initializing drawing  '{drawing_name}' for fixtures...")
                 
             # Step 1: Load Universal Functions LISP
-            universal_path = self.lisp_files.get("universal", "").replace('\\', '/')
-            if universal_path and os.path.exists(universal_path.replace('/', '\\')):
-                logger.info(f"Loading universal functions: {universal_path}")
-                doc.SendCommand(f'(load "{universal_path}")\n')
+            if self._load_lisp_file("universal", doc):
                 time.sleep(1.5)
             else:
-                logger.error(f"Universal LISP file not found: {universal_path}")
                 return False
             
             # Step 2: Insert LSAD_Styles block to create all styles/layers
             # This block contains definitions for all required layers, dimstyles, textstyles
             logger.info("Inserting LSAD_Styles block to initialize drawing...")
-            doc.SendCommand('(command "_.insert" "LSAD_Styles" (list 0 0 0) "" "" "")\n')
+            self._send_command(doc, '(command "_.insert" "LSAD_Styles" (list 0 0 0) "" "" "")\n')
             time.sleep(2)
             
             # Step 3: Check if insert succeeded (block might not be in search path)
             # If it failed, we need to handle that
-            doc.SendCommand('(if (entlast) (command "_.erase" (entlast) ""))\n')
+            self._send_command(doc, '(if (entlast) (command "_.erase" (entlast) ""))\n')
             time.sleep(1)
             
             # Step 4: Set up commonly needed system variables
-            doc.SendCommand('(setvar "cmdecho" 0)\n')
+            self._send_command(doc, '(setvar "cmdecho" 0)\n')
             time.sleep(0.3)
-            doc.SendCommand('(setvar "attreq" 0)\n')
+            self._send_command(doc, '(setvar "attreq" 0)\n')
             time.sleep(0.3)
-            doc.SendCommand('(setvar "attdia" 0)\n')
+            self._send_command(doc, '(setvar "attdia" 0)\n')
             time.sleep(0.3)
             
             # Step 5: Load fixture-specific LISP if specified
             if fixture_type and fixture_type in self.lisp_files:
-                fixture_path = self.lisp_files[fixture_type].replace('\\', '/')
-                if os.path.exists(fixture_path.replace('/', '\\')):
-                    logger.info(f"Loading {fixture_type} LISP: {fixture_path}")
-                    doc.SendCommand(f'(load "{fixture_path}")\n')
+                if self._load_lisp_file(fixture_type, doc):
                     time.sleep(1.5)
             
             # Step 6: Set ApiMode flag to suppress alerts during API calls
-            doc.SendCommand('(setq ApiMode T)\n')
+            self._send_command(doc, '(setq ApiMode T)\n')
             time.sleep(0.3)
 
             # Mark this drawing as initialized
-            self._initialized_drawings.add(drawing_name)
+            self._initialized_drawings.add(drawing_key)
             logger.info(f"Drawing '{drawing_name}' initialization complete")
             return True
             
@@ -988,11 +1171,11 @@ class AutoDrawAIAgent:
         """
         try:
             # Check for a layer that only exists after LSAD_Styles is loaded
-            doc.SendCommand('(if (tblsearch "LAYER" "Housing") (princ "INITIALIZED") (princ "NOT_INITIALIZED"))\n')
+            self._send_command(doc, '(if (tblsearch "LAYER" "Housing") (princ "INITIALIZED") (princ "NOT_INITIALIZED"))\n')
             time.sleep(0.5)
             # Note: We can't easily read the response, so this is informational only
             return True
-        except:
+        except pywintypes.com_error:
             return False
 
     # =========================================================================
@@ -1011,29 +1194,47 @@ class AutoDrawAIAgent:
         Returns:
             List of result dictionaries
         """
-        results = []
+        results = [None] * len(fixture_list)
+        
+        # PG fixtures are collected and sent to AutoCAD as one group
+        pg_indices = []
+        pg_specs = []
         
         for i, item in enumerate(fixture_list):
-            logger.info(f"Processing fixture {i+1}/{len(fixture_list)}")
+            logger.info("Processing fixture %d/%d", i + 1, len(fixture_list))
             
             fixture_type = item.get('fixture_type')
             specs = item.get('specifications', {})
             
             if not fixture_type:
-                results.append({
+                results[i] = {
                     "success": False,
                     "error": "Missing fixture_type",
                     "index": i
-                })
+                }
+                continue
+            
+            # Reject incomplete specs before any COM work is done for them
+            canonical = _NORMALIZE_FIXTURE_TYPE.get(fixture_type, fixture_type)
+            if canonical in _FIXTURE_TYPES and isinstance(specs, dict):
+                error = self._validate_required_fields(specs, canonical)
+                if error:
+                    results[i] = {"success": False, "error": error, "index": i}
+                    continue
+            
+            if canonical == "PG":
+                pg_indices.append(i)
+                pg_specs.append(specs)
                 continue
             
             result = self.draw_fixture(fixture_type, specs)
             result['index'] = i
-            results.append(result)
-            
-            # Small delay between drawings to prevent AutoCAD overload
-            import time
-            time.sleep(0.5)
+            results[i] = result
+        
+        if pg_specs:
+            for i, result in zip(pg_indices, self._draw_pg_fixtures(pg_specs)):
+                result['index'] = i
+                results[i] = result
         
         # Summary
         successful = sum(1 for r in results if r.get('success'))
@@ -1056,7 +1257,7 @@ class AutoDrawAIAgent:
             Dictionary with success status
         """
         try:
-            autocad, doc, modelspace = self._get_autocad_objects()
+            autocad, doc, modelspace = self._get_autocad_objects(active=True)
             
             if filepath:
                 doc.SaveAs(filepath)
@@ -1079,7 +1280,7 @@ class AutoDrawAIAgent:
             Dictionary with success status
         """
         try:
-            autocad, doc, modelspace = self._get_autocad_objects()
+            autocad, doc, modelspace = self._get_autocad_objects(active=True)
             
             new_doc = autocad.Documents.Add()
             self._thread_local.doc = new_doc
@@ -1095,8 +1296,8 @@ class AutoDrawAIAgent:
     def zoom_extents(self) -> Dict:
         """Zoom to show all objects in the drawing."""
         try:
-            autocad, doc, modelspace = self._get_autocad_objects()
-            doc.SendCommand("_ZOOM _E ")
+            autocad, doc, modelspace = self._get_autocad_objects(active=True)
+            self._send_command(doc, "_ZOOM _E ")
             return {"success": True}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -1104,8 +1305,8 @@ class AutoDrawAIAgent:
     def purge_drawing(self) -> Dict:
         """Purge unused objects from the drawing."""
         try:
-            autocad, doc, modelspace = self._get_autocad_objects()
-            doc.SendCommand("_PURGE _ALL * _N ")
+            autocad, doc, modelspace = self._get_autocad_objects(active=True)
+            self._send_command(doc, "_PURGE _ALL * _N ")
             logger.info("Drawing purged")
             return {"success": True, "message": "Drawing purged"}
         except Exception as e:
@@ -1136,12 +1337,13 @@ class AutoDrawAIAgent:
     def get_status(self) -> Dict:
         """Get current connection status."""
         try:
-            autocad, doc, modelspace = self._get_autocad_objects()
+            autocad, doc, modelspace = self._get_autocad_objects(active=True)
+            doc_key = self._document_key(doc)
             return {
                 "connected": True,
                 "autocad_name": autocad.Name,
                 "document_name": doc.Name,
-                "loaded_lisp_files": list(self._loaded_lisp),
+                "loaded_lisp_files": sorted({key for token, key in self._loaded_lisp if token == doc_key}),
                 "supported_fixtures": self.get_supported_fixtures()
             }
         except Exception as e:
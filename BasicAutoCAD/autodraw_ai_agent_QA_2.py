@@ -10,8 +10,9 @@ import threading
 import pythoncom
 import traceback
 import time
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from functools import lru_cache
 
 # ------------------------------------------------------------
 # Logging
@@ -22,6 +23,62 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+_ACAD_PROGID = "AutoCAD.Application"
+try:
+    _ACAD_ROT_NAME = "!" + str(pythoncom.ProgIDToCLSID(_ACAD_PROGID)).lower()
+except pythoncom.com_error:
+    _ACAD_ROT_NAME = None  # not registered; Dispatch will report it
+
+
+def _find_running_autocad():
+    """
+    Look AutoCAD up in the Running Object Table; None if it is not running
+    """
+    if _ACAD_ROT_NAME is None:
+        return None
+    rot = pythoncom.GetRunningObjectTable()
+    ctx = pythoncom.CreateBindCtx(0)
+    for moniker in rot.EnumRunning():
+        if moniker.GetDisplayName(ctx, None).lower() == _ACAD_ROT_NAME:
+            obj = rot.GetObject(moniker)
+            return win32com.client.Dispatch(obj.QueryInterface(pythoncom.IID_IDispatch))
+    return None
+
+
+# Per-thread count of agents holding COM initialized on that thread
+_com_state = threading.local()
+
+# Marker left in the drawing once it is prepared. USERS1-5 are not saved
+# with the DWG, so the marker lives exactly as long as the loaded LISP does.
+_SENTINEL_VAR = "USERS5"
+_SENTINEL_TAG = "AUTODRAW:"
+
+_FINISH_MAP = {
+    "WH": "White", "WHITE": "White",
+    "BK": "Black", "BLACK": "Black",
+    "SL": "Silver", "SILVER": "Silver",
+    "CC": "CC",
+}
+
+
+@lru_cache(maxsize=64)
+def _finish_name(f: str) -> str:
+    # Layouts reuse a handful of finish spellings, so cache the upper()
+    return _FINISH_MAP.get(f.upper(), "White")
+
+
+# Fixture API calls, filled with str.format_map per draw
+_PG_ARGS_TMPL = (
+    '"{series}" "{mounting}" "{output}" {regress} '
+    '{length_ft} {length_in} 0 0 nil "{finish}" '
+    '"Exact" "EqualLength" 0 nil "{fixture_num}" 1 "" "" {start_x} {start_y}'
+)
+_PG_CMD_TMPL = "(c:PGAutoAPI " + _PG_ARGS_TMPL + ")"
+_MAGTRK_CMD_TMPL = (
+    '(c:MagTrkAutoAPI "{series}" "{mounting}" 0 nil nil "{finish}" '
+    '"Nom" "EqualLength" 0 nil {length_ft} {length_in} "F1" 1 "" "" 0 0)'
+)
+
 
 class AutoDrawAIAgent:
     """
@@ -35,34 +92,80 @@ class AutoDrawAIAgent:
     def __init__(self, initialize_autocad: bool = True):
         self.lisp_base_path = r"C:\Users\coronetastera\Documents\Lisp and Dialogue files\Lisp"
         self._thread_local = threading.local()
-        self._loaded_lisp = set()
-        self._initialized_drawings = set()
 
         self._setup_lisp_files()
 
         if initialize_autocad:
             self._initialize_autocad_connection()
 
-    def _initialize_autocad_connection(self):
-        pythoncom.CoInitialize()
+    # Setup caches live with the COM objects, one set per thread, so
+    # threads never mutate shared state
+    @property
+    def _loaded_lisp(self):
+        tl = self._thread_local
+        if not hasattr(tl, "loaded_lisp"):
+            tl.loaded_lisp = set()
+        return tl.loaded_lisp
+
+    @property
+    def _initialized_drawings(self):
+        tl = self._thread_local
+        if not hasattr(tl, "initialized_drawings"):
+            tl.initialized_drawings = set()
+        return tl.initialized_drawings
+
+    def _com_init(self):
+        # One CoInitialize per thread, shared by every agent on it
+        if getattr(self._thread_local, "com_inited", False):
+            return
+        refs = getattr(_com_state, "refs", 0)
+        if refs == 0:
+            pythoncom.CoInitialize()
+        _com_state.refs = refs + 1
+        self._thread_local.com_inited = True
+
+    def _com_release(self):
+        if not getattr(self._thread_local, "com_inited", False):
+            return
+        self._thread_local.com_inited = False
+        _com_state.refs -= 1
+        if _com_state.refs == 0:
+            pythoncom.CoUninitialize()
 
+    def _initialize_autocad_connection(self):
+        self._com_init()
+
+        # COM stays initialized if this fails; close_connection releases it
+        autocad = _find_running_autocad()
+        if autocad is not None:
+            logger.info("Connected to existing AutoCAD")
+        else:
+            autocad = win32com.client.Dispatch(_ACAD_PROGID)
+            logger.info("Started new AutoCAD")
+        self._thread_local.autocad = autocad
+
+        # Early binding resolves dispatch IDs once instead of per call
         try:
-            try:
-                self._thread_local.autocad = win32com.client.GetActiveObject("AutoCAD.Application")
-                logger.info("Connected to existing AutoCAD")
-            except Exception:
-                self._thread_local.autocad = win32com.client.Dispatch("AutoCAD.Application")
-                logger.info("Started new AutoCAD")
+            self._thread_local.autocad = win32com.client.gencache.EnsureDispatch(
+                self._thread_local.autocad
+            )
+        except Exception:
+            logger.debug("Early binding unavailable, using late-bound AutoCAD")
 
-            time.sleep(1)
+        time.sleep(1)
 
-            doc = self._thread_local.autocad.ActiveDocument
-            self._thread_local.doc = doc
-            self._thread_local.modelspace = doc.ModelSpace
+        doc = self._thread_local.autocad.ActiveDocument
+        self._thread_local.doc = doc
+        self._thread_local.modelspace = doc.ModelSpace
 
-        except Exception:
-            pythoncom.CoUninitialize()
-            raise
+    def close_connection(self):
+        """
+        Drop this thread's AutoCAD objects and release its COM init
+        """
+        for attr in ("autocad", "doc", "modelspace"):
+            if hasattr(self._thread_local, attr):
+                delattr(self._thread_local, attr)
+        self._com_release()
 
     def _get_autocad_objects(self):
         if not hasattr(self._thread_local, "autocad"):
@@ -84,32 +187,37 @@ class AutoDrawAIAgent:
             "MagTrk": os.path.join(self.lisp_base_path, "Mag-Trk_AutoDraw_API.lsp"),
         }
 
+        # LISP wants forward slashes; build the load forms once
+        self.lisp_files_posix = {k: v.replace("\\", "/") for k, v in self.lisp_files.items()}
+        self._lisp_load_forms = {k: f'(load "{v}")' for k, v in self.lisp_files_posix.items()}
+
         self.fixture_api_map = {
             "PG": "c:PGAutoAPI",
             "MagTrk": "c:MagTrkAutoAPI",
         }
 
-        self.finish_map = {
-            "WH": "White", "WHITE": "White",
-            "BK": "Black", "BLACK": "Black",
-            "SL": "Silver", "SILVER": "Silver",
-            "CC": "CC",
-        }
+        self.finish_map = _FINISH_MAP
 
     # =========================================================
     # CORE SEND / WAIT (CRITICAL)
     # =========================================================
 
     def _wait_for_autocad(self, doc, timeout=30):
+        # Most commands finish in a few ms, so poll fast first and back off
         start = time.time()
+        delay = 0.002
+        get_var = doc.GetVariable
         while time.time() - start < timeout:
             try:
-                if doc.GetVariable("CMDACTIVE") == 0:
-                    time.sleep(0.2)
+                if get_var("CMDACTIVE") == 0:
                     return True
             except Exception:
                 pass
-            time.sleep(0.2)
+            # Service COM callbacks for this apartment, then sleep with the
+            # GIL released so other threads keep running
+            pythoncom.PumpWaitingMessages()
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
 
         logger.warning("AutoCAD command may not have completed within timeout")
         return False
@@ -119,7 +227,8 @@ class AutoDrawAIAgent:
         SINGLE SAFE ENTRY POINT FOR COMMANDS
         """
         try:
-            logger.info("Sending LISP command")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Sending LISP: %s", cmd[:80])
             doc.SendCommand(cmd.rstrip() + "\n")
             return self._wait_for_autocad(doc)
         except Exception as e:
@@ -130,30 +239,90 @@ class AutoDrawAIAgent:
     # DRAWING INITIALIZATION (ONCE)
     # =========================================================
 
-    def _initialize_drawing_for_fixtures(self, doc, fixture_type=None):
-        name = doc.Name
-        if name in self._initialized_drawings:
-            return True
-
-        logger.info(f"Initializing drawing: {name}")
-
-        uni = self.lisp_files["universal"].replace("\\", "/")
-        self._send_lisp_command(doc, f'(load "{uni}")')
-
-        self._send_lisp_command(
-            doc,
-            '(command "_.insert" "LSAD_Styles" (list 0 0 0) "" "" "")'
-        )
+    @staticmethod
+    def _progn(forms: List[str]) -> str:
+        """
+        Wrap LISP forms so they go to AutoCAD in one SendCommand
+        """
+        if len(forms) == 1:
+            return forms[0]
+        return "(progn " + " ".join(forms) + ")"
 
-        self._send_lisp_command(doc, '(setq ApiMode T)')
+    def _drawing_init_forms(self, doc, fixture_types=()) -> Tuple[List[str], List[str]]:
+        """
+        LISP forms that still need to run to prepare this drawing and
+        load the given fixture APIs (empty once all of that is done),
+        and the fixture types they load. The caches are only updated by
+        _mark_drawing_setup once AutoCAD has run the forms.
+        """
+        name = doc.Name
+        forms, new_types = [], []
+
+        if name not in self._initialized_drawings:
+            self._read_sentinel(doc, name)
+
+        if name not in self._initialized_drawings:
+            logger.info(f"Initializing drawing: {name}")
+            forms += [
+                self._lisp_load_forms["universal"],
+                '(if (not (tblsearch "BLOCK" "LSAD_Styles")) '
+                '(command "_.insert" "LSAD_Styles" (list 0 0 0) "" "" ""))',
+                '(setq ApiMode T)',
+            ]
+
+        for fixture_type in fixture_types:
+            if fixture_type in self._lisp_load_forms and (name, fixture_type) not in self._loaded_lisp:
+                forms.append(self._lisp_load_forms[fixture_type])
+                new_types.append(fixture_type)
+
+        if forms:
+            loaded = {t for n, t in self._loaded_lisp if n == name}.union(new_types)
+            forms.append(f'(setvar "{_SENTINEL_VAR}" "{_SENTINEL_TAG}{",".join(sorted(loaded))}")')
+        return forms, new_types
+
+    def _mark_drawing_setup(self, name, new_types):
+        """
+        Record setup forms from _drawing_init_forms that AutoCAD has run
+        """
+        self._initialized_drawings.add(name)
+        self._loaded_lisp.update((name, fixture_type) for fixture_type in new_types)
 
-        if fixture_type in self.lisp_files:
-            fx = self.lisp_files[fixture_type].replace("\\", "/")
-            self._send_lisp_command(doc, f'(load "{fx}")')
+    def _read_sentinel(self, doc, name):
+        """
+        Pick up setup done by an earlier session on this open drawing
+        """
+        try:
+            value = doc.GetVariable(_SENTINEL_VAR)
+        except Exception:
+            return
+        if not isinstance(value, str) or not value.startswith(_SENTINEL_TAG):
+            return
 
+        logger.info(f"Drawing already initialized: {name}")
         self._initialized_drawings.add(name)
+        for fixture_type in value[len(_SENTINEL_TAG):].split(","):
+            if fixture_type:
+                self._loaded_lisp.add((name, fixture_type))
+
+    def _initialize_drawing_for_fixtures(self, doc, fixture_type=None):
+        forms, new_types = self._drawing_init_forms(doc, (fixture_type,) if fixture_type else ())
+        if forms:
+            if not self._send_lisp_command(doc, self._progn(forms)):
+                return False
+            self._mark_drawing_setup(doc.Name, new_types)
         return True
 
+    def _send_fixture_commands(self, fixture_types, cmds: List[str]) -> bool:
+        """
+        Send fixture calls, plus any setup they still need, in one progn
+        """
+        autocad, doc, _ = self._get_autocad_objects()
+        forms, new_types = self._drawing_init_forms(doc, fixture_types)
+        ok = self._send_lisp_command(doc, self._progn(forms + cmds))
+        if ok:
+            self._mark_drawing_setup(doc.Name, new_types)
+        return ok
+
     # =========================================================
     # PG FIXTURE
     # =========================================================
@@ -171,39 +340,102 @@ class AutoDrawAIAgent:
             logger.error(traceback.format_exc())
             return {"success": False, "error": str(e)}
 
+    def draw_fixtures_batch(self, items: List[Tuple[str, Dict]]) -> List[Dict]:
+        """
+        Draw many fixtures with a single SendCommand and a single wait.
+
+        items is a list of (fixture_type, specs); one result is returned
+        per item, in order.
+        """
+        builders = {"PG": self._build_pg_cmd, "MagTrk": self._build_magtrk_cmd}
+        results = [None] * len(items)
+        cmds, sent, types = [], [], []
+
+        for i, (fixture_type, specs) in enumerate(items):
+            build = builders.get(fixture_type)
+            if build is None:
+                results[i] = {"success": False, "error": "Unsupported fixture"}
+                continue
+            try:
+                cmds.append(build(specs))
+            except Exception as e:
+                results[i] = {"success": False, "error": str(e)}
+                continue
+            sent.append(i)
+            if fixture_type not in types:
+                types.append(fixture_type)
+
+        if cmds:
+            try:
+                result = {"success": self._send_fixture_commands(types, cmds)}
+            except Exception as e:
+                logger.error(traceback.format_exc())
+                result = {"success": False, "error": str(e)}
+            for i in sent:
+                results[i] = dict(result)
+
+        return results
+
     def _map_finish(self, f):
-        return self.finish_map.get(str(f).upper(), "White")
+        return _finish_name(f if isinstance(f, str) else str(f))
+
+    def _pg_values(self, specs: Dict) -> Dict:
+        return {
+            "series": specs["series"],
+            "mounting": specs["mounting"],
+            "output": specs["output"],
+            "regress": int(specs["regress"]),
+            "length_ft": float(specs["length_ft"]),
+            "length_in": float(specs.get("length_in", 0)),
+            "finish": self._map_finish(specs.get("finish")),
+            "fixture_num": specs.get("fixture_num", "F1"),
+            "start_x": float(specs["start_x"]) if "start_x" in specs else 0,
+            "start_y": float(specs["start_y"]) if "start_y" in specs else 0,
+        }
 
-    def _draw_pg_fixture(self, specs: Dict) -> Dict:
-        autocad, doc, _ = self._get_autocad_objects()
-        self._initialize_drawing_for_fixtures(doc, "PG")
-
-        cmd = (
-            f'(c:PGAutoAPI "{specs["series"]}" "{specs["mounting"]}" '
-            f'"{specs["output"]}" {int(specs["regress"])} '
-            f'{float(specs["length_ft"])} {float(specs.get("length_in", 0))} '
-            f'0 0 nil "{self._map_finish(specs.get("finish"))}" '
-            f'"Exact" "EqualLength" 0 nil "F1" 1 "" "" 0 0)'
-        )
+    def _build_pg_cmd(self, specs: Dict) -> str:
+        return _PG_CMD_TMPL.format_map(self._pg_values(specs))
 
-        ok = self._send_lisp_command(doc, cmd)
+    def draw_pg_fixtures(self, common_specs: Dict, per_fixture_overrides: List[Dict]) -> Dict:
+        """
+        Draw a run of PG fixtures that share most specs and differ only in
+        a few fields (start_x/start_y, fixture_num, ...). AutoCAD loops over
+        the argument lists itself, so the whole run is one SendCommand.
+        """
+        try:
+            if not per_fixture_overrides:
+                return {"success": True}
+
+            arg_lists = " ".join(
+                "(" + _PG_ARGS_TMPL.format_map(self._pg_values({**common_specs, **o})) + ")"
+                for o in per_fixture_overrides
+            )
+            cmd = f"(foreach a '({arg_lists}) (apply 'c:PGAutoAPI a))"
+
+            ok = self._send_fixture_commands(("PG",), [cmd])
+            return {"success": ok}
+
+        except Exception as e:
+            logger.error(traceback.format_exc())
+            return {"success": False, "error": str(e)}
+
+    def _draw_pg_fixture(self, specs: Dict) -> Dict:
+        ok = self._send_fixture_commands(("PG",), [self._build_pg_cmd(specs)])
         return {"success": ok}
 
     # =========================================================
     # MAGTRK FIXTURE
     # =========================================================
 
-    def _draw_magtrk_fixture(self, specs: Dict) -> Dict:
-        autocad, doc, _ = self._get_autocad_objects()
-        self._initialize_drawing_for_fixtures(doc, "MagTrk")
-
-        cmd = (
-            f'(c:MagTrkAutoAPI "{specs["series"]}" "{specs["mounting"]}" '
-            f'0 nil nil "{self._map_finish(specs.get("finish"))}" '
-            f'"Nom" "EqualLength" 0 nil '
-            f'{float(specs["length_ft"])} {float(specs.get("length_in", 0))} '
-            f'"F1" 1 "" "" 0 0)'
-        )
+    def _build_magtrk_cmd(self, specs: Dict) -> str:
+        return _MAGTRK_CMD_TMPL.format_map({
+            "series": specs["series"],
+            "mounting": specs["mounting"],
+            "finish": self._map_finish(specs.get("finish")),
+            "length_ft": float(specs["length_ft"]),
+            "length_in": float(specs.get("length_in", 0)),
+        })
 
-        ok = self._send_lisp_command(doc, cmd)
+    def _draw_magtrk_fixture(self, specs: Dict) -> Dict:
+        ok = self._send_fixture_commands(("MagTrk",), [self._build_magtrk_cmd(specs)])
         return {"success": ok}
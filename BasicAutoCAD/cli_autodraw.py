@@ -11,13 +11,70 @@ import os
 from typing import Dict, List
 import logging
 
-from autodraw_ai_agent import AutoDrawAIAgent
 import config
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# (argument attribute, spec key) for each specifications section, in output order
+_DIM_MAP = (
+    ('length', 'length'),
+    ('width', 'width'),
+    ('height', 'height'),
+    ('radius', 'radius'),
+    ('major_axis', 'major_axis'),
+    ('minor_axis', 'minor_axis'),
+)
+_POS_MAP = (
+    ('start', 'start_point', 'start point'),
+    ('end', 'end_point', 'end point'),
+    ('center', 'center_point', 'center point'),
+    ('insertion_point', 'insertion_point', 'insertion point'),
+)
+_SPEC_MAP = (
+    ('wattage', 'wattage'),
+    ('color_temp', 'color_temperature'),
+    ('lens', 'lens_type'),
+    ('mounting', 'mounting_type'),
+    ('driver', 'driver_type'),
+    ('text_content', 'text_content'),
+    ('text_height', 'text_height'),
+    ('block_name', 'block_name'),
+    ('pattern_name', 'pattern_name'),
+)
+_ADD_MAP = tuple((name, name) for name in (
+    'spacing', 'voltage', 'emergency_backup', 'dimmable', 'ip_rating',
+    'start_angle', 'end_angle', 'closed', 'array_type', 'rows', 'columns',
+    'row_spacing', 'column_spacing', 'num_items', 'scale_factor', 'rotation',
+    'offset_distance', 'fillet_radius', 'chamfer_distance1', 'chamfer_distance2',
+))
+
+
+def _parse_xy(text: str) -> List[float]:
+    """Parse an "x,y" argument into a point on the XY plane"""
+    x, y = text.split(',')
+    return [float(x), float(y), 0]
+
+
+def _positive_int(text: str) -> int:
+    """Parse a count argument that must be at least 1"""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def _collect_section(args: argparse.Namespace, table) -> Dict:
+    """Copy the set (truthy) arguments named in table into a spec section"""
+    section = {}
+    for attr, key in table:
+        value = getattr(args, attr)
+        if value:
+            section[key] = value
+    return section
+
+
 class AutoDrawCLI:
     """
     Command Line Interface for AutoDraw AI Agent
@@ -25,6 +82,13 @@ class AutoDrawCLI:
     
     def __init__(self):
         self.agent = None
+    
+    def _create_agent(self, initialize_autocad: bool = True):
+        """Create the AI agent, importing it only when a command needs it"""
+        # The agent pulls in pywin32 and the OpenAI client, which --help,
+        # argument errors and parameter-only dry runs never need
+        from autodraw_ai_agent import AutoDrawAIAgent
+        return AutoDrawAIAgent(initialize_autocad=initialize_autocad)
         
     def parse_arguments(self) -> argparse.Namespace:
         """Parse command line arguments"""
@@ -86,6 +150,12 @@ Examples:
             type=str,
             help='File containing multiple drawing requests (one per line)'
         )
+        parser.add_argument(
+            '--batch-size',
+            type=_positive_int,
+            default=10,
+            help='Batch file requests parsed per AI call (default: 10)'
+        )
         
         # System specification group
         system_group = parser.add_argument_group('System Specifications')
@@ -379,134 +449,43 @@ Examples:
             specs['lighting_system'] = args.system
         
         # Dimensions
-        if any([args.length, args.width, args.height, args.radius, args.major_axis, args.minor_axis]):
-            specs['dimensions'] = {}
-            if args.length:
-                specs['dimensions']['length'] = args.length
-            if args.width:
-                specs['dimensions']['width'] = args.width
-            if args.height:
-                specs['dimensions']['height'] = args.height
-            if args.radius:
-                specs['dimensions']['radius'] = args.radius
-            if args.major_axis:
-                specs['dimensions']['major_axis'] = args.major_axis
-            if args.minor_axis:
-                specs['dimensions']['minor_axis'] = args.minor_axis
+        dimensions = _collect_section(args, _DIM_MAP)
+        if dimensions:
+            specs['dimensions'] = dimensions
         
         # Position
-        if any([args.start, args.end, args.center, args.insertion_point, args.points, args.orientation]):
-            specs['position'] = {}
-            if args.start:
+        position = {}
+        for attr, key, label in _POS_MAP:
+            value = getattr(args, attr)
+            if value:
                 try:
-                    x, y = map(float, args.start.split(','))
-                    specs['position']['start_point'] = [x, y, 0]
+                    position[key] = _parse_xy(value)
                 except ValueError:
-                    logger.error("Invalid start point format. Use 'x,y'")
+                    logger.error(f"Invalid {label} format. Use 'x,y'")
                     return None
-            if args.end:
-                try:
-                    x, y = map(float, args.end.split(','))
-                    specs['position']['end_point'] = [x, y, 0]
-                except ValueError:
-                    logger.error("Invalid end point format. Use 'x,y'")
-                    return None
-            if args.center:
-                try:
-                    x, y = map(float, args.center.split(','))
-                    specs['position']['center_point'] = [x, y, 0]
-                except ValueError:
-                    logger.error("Invalid center point format. Use 'x,y'")
-                    return None
-            if args.insertion_point:
-                try:
-                    x, y = map(float, args.insertion_point.split(','))
-                    specs['position']['insertion_point'] = [x, y, 0]
-                except ValueError:
-                    logger.error("Invalid insertion point format. Use 'x,y'")
-                    return None
-            if args.points:
-                try:
-                    points = []
-                    for point_str in args.points.split(';'):
-                        x, y = map(float, point_str.split(','))
-                        points.append([x, y, 0])
-                    specs['position']['points'] = points
-                except ValueError:
-                    logger.error("Invalid points format. Use 'x1,y1;x2,y2;x3,y3'")
-                    return None
-            specs['position']['orientation'] = args.orientation
+        if args.points:
+            try:
+                position['points'] = [_parse_xy(p) for p in args.points.split(';')]
+            except ValueError:
+                logger.error("Invalid points format. Use 'x1,y1;x2,y2;x3,y3'")
+                return None
+        if position or args.orientation:
+            position['orientation'] = args.orientation
+            specs['position'] = position
         
         # Specifications
-        if any([args.wattage, args.color_temp, args.lens, args.mounting, args.driver, args.quantity, 
-                args.text_content, args.text_height, args.block_name, args.pattern_name]):
-            specs['specifications'] = {}
-            if args.wattage:
-                specs['specifications']['wattage'] = args.wattage
-            if args.color_temp:
-                specs['specifications']['color_temperature'] = args.color_temp
-            if args.lens:
-                specs['specifications']['lens_type'] = args.lens
-            if args.mounting:
-                specs['specifications']['mounting_type'] = args.mounting
-            if args.driver:
-                specs['specifications']['driver_type'] = args.driver
-            if args.text_content:
-                specs['specifications']['text_content'] = args.text_content
-            if args.text_height:
-                specs['specifications']['text_height'] = args.text_height
-            if args.block_name:
-                specs['specifications']['block_name'] = args.block_name
-            if args.pattern_name:
-                specs['specifications']['pattern_name'] = args.pattern_name
-            specs['specifications']['quantity'] = args.quantity
+        specifications = _collect_section(args, _SPEC_MAP)
+        if specifications or args.quantity:
+            specifications['quantity'] = args.quantity
+            specs['specifications'] = specifications
         
-        # Additional parameters
-        if any([args.spacing, args.voltage, args.emergency_backup, args.dimmable, args.ip_rating,
-                args.start_angle, args.end_angle, args.closed, args.array_type, args.rows, args.columns,
-                args.row_spacing, args.column_spacing, args.num_items, args.scale_factor, args.rotation,
-                args.offset_distance, args.fillet_radius, args.chamfer_distance1, args.chamfer_distance2]):
-            specs['additional_parameters'] = {}
-            if args.spacing:
-                specs['additional_parameters']['spacing'] = args.spacing
-            if args.voltage:
-                specs['additional_parameters']['voltage'] = args.voltage
-            if args.emergency_backup:
-                specs['additional_parameters']['emergency_backup'] = 'true'
-            if args.dimmable:
-                specs['additional_parameters']['dimmable'] = 'true'
-            if args.ip_rating:
-                specs['additional_parameters']['ip_rating'] = args.ip_rating
-            if args.start_angle:
-                specs['additional_parameters']['start_angle'] = args.start_angle
-            if args.end_angle:
-                specs['additional_parameters']['end_angle'] = args.end_angle
-            if args.closed:
-                specs['additional_parameters']['closed'] = 'true'
-            if args.array_type:
-                specs['additional_parameters']['array_type'] = args.array_type
-            if args.rows:
-                specs['additional_parameters']['rows'] = args.rows
-            if args.columns:
-                specs['additional_parameters']['columns'] = args.columns
-            if args.row_spacing:
-                specs['additional_parameters']['row_spacing'] = args.row_spacing
-            if args.column_spacing:
-                specs['additional_parameters']['column_spacing'] = args.column_spacing
-            if args.num_items:
-                specs['additional_parameters']['num_items'] = args.num_items
-            if args.scale_factor:
-                specs['additional_parameters']['scale_factor'] = args.scale_factor
-            if args.rotation:
-                specs['additional_parameters']['rotation'] = args.rotation
-            if args.offset_distance:
-                specs['additional_parameters']['offset_distance'] = args.offset_distance
-            if args.fillet_radius:
-                specs['additional_parameters']['fillet_radius'] = args.fillet_radius
-            if args.chamfer_distance1:
-                specs['additional_parameters']['chamfer_distance1'] = args.chamfer_distance1
-            if args.chamfer_distance2:
-                specs['additional_parameters']['chamfer_distance2'] = args.chamfer_distance2
+        # Additional parameters (on/off flags are passed as 'true')
+        additional = _collect_section(args, _ADD_MAP)
+        if additional:
+            specs['additional_parameters'] = {
+                key: 'true' if value is True else value
+                for key, value in additional.items()
+            }
         
         return specs
     
@@ -606,7 +585,7 @@ Examples:
         try:
             if not self.agent:
                 # Don't initialize AutoCAD for dry runs
-                self.agent = AutoDrawAIAgent(initialize_autocad=not dry_run)
+                self.agent = self._create_agent(initialize_autocad=not dry_run)
             
             return self.agent.process_natural_language_request(natural_input)
         except Exception as e:
@@ -618,14 +597,14 @@ Examples:
         try:
             if not self.agent:
                 # Don't initialize AutoCAD for dry runs
-                self.agent = AutoDrawAIAgent(initialize_autocad=not dry_run)
+                self.agent = self._create_agent(initialize_autocad=not dry_run)
             
             return self.agent.create_complete_drawing(specs)
         except Exception as e:
             logger.error(f"Error executing drawing: {e}")
             return {"success": False, "error": str(e)}
     
-    def process_batch_file(self, file_path: str) -> List[Dict]:
+    def process_batch_file(self, file_path: str, batch_size: int = 10) -> List[Dict]:
         """Process a batch file with multiple requests"""
         try:
             with open(file_path, 'r') as f:
@@ -634,6 +613,16 @@ Examples:
             requests = [line.strip() for line in lines if line.strip()]
             logger.info(f"Loaded {len(requests)} requests from {file_path}")
             
+            # Parse batch_size requests per AI call when the agent supports it
+            if not self.agent:
+                self.agent = self._create_agent()
+            if hasattr(self.agent, 'process_natural_language_requests'):
+                from openai import OpenAIError
+                try:
+                    return self.agent.process_natural_language_requests(requests, batch_size=batch_size)
+                except OpenAIError as e:
+                    logger.error(f"Batched parsing failed, parsing requests one at a time: {e}")
+            
             results = []
             for i, request in enumerate(requests, 1):
                 logger.info(f"Processing request {i}/{len(requests)}: {request}")
@@ -670,6 +659,18 @@ Examples:
             print("AutoDraw AI Agent - Command Line Interface")
             print("="*50)
             
+            # Validate that at least one input method is provided
+            if not args.natural and not args.batch_file and not args.command and not args.system and not args.import_assets and not args.list_blocks:
+                logger.error("No input method specified")
+                print("Please specify one of the following:")
+                print("  --natural: Natural language description")
+                print("  --batch-file: File with multiple requests")
+                print("  --command: Direct AutoCAD command (rectangle, circle, etc.)")
+                print("  --system: Lighting system type")
+                print("  --import-assets: Import .dwg files as blocks")
+                print("  --list-blocks: List available blocks")
+                sys.exit(1)
+            
             # Test AutoCAD connection if not in dry-run mode
             if not args.dry_run:
                 logger.info("Testing AutoCAD connection...")
@@ -692,25 +693,13 @@ Examples:
                     logger.error("pywin32 not installed. Please install it with: pip install pywin32")
                     sys.exit(1)
             
-            # Validate that at least one input method is provided
-            if not args.natural and not args.batch_file and not args.command and not args.system and not args.import_assets and not args.list_blocks:
-                logger.error("No input method specified")
-                print("Please specify one of the following:")
-                print("  --natural: Natural language description")
-                print("  --batch-file: File with multiple requests")
-                print("  --command: Direct AutoCAD command (rectangle, circle, etc.)")
-                print("  --system: Lighting system type")
-                print("  --import-assets: Import .dwg files as blocks")
-                print("  --list-blocks: List available blocks")
-                sys.exit(1)
-            
             # Initialize agent for asset management commands
             if args.import_assets or args.list_blocks:
                 if args.dry_run:
                     print("Asset management commands require AutoCAD connection (cannot use --dry-run)")
                     sys.exit(1)
                 
-                self.agent = AutoDrawAIAgent()
+                self.agent = self._create_agent()
             
             # Handle asset management commands
             if args.import_assets:
@@ -765,7 +754,7 @@ Examples:
             elif args.batch_file:
                 # Batch processing
                 logger.info("Processing batch file")
-                results = self.process_batch_file(args.batch_file)
+                results = self.process_batch_file(args.batch_file, batch_size=args.batch_size)
                 
                 if args.dry_run:
                     print(f"Dry run completed - {len(results)} requests parsed")
@@ -6,14 +6,40 @@ Tests the functionality without requiring AutoCAD connection
 import json
 import sys
 import os
-from unittest.mock import Mock, patch
+from contextlib import contextmanager
 
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+import autodraw_ai_agent
 from autodraw_ai_agent import AutoDrawAIAgent
 import config
 
+class _FakeDoc:
+    """Stand-in for an AutoCAD document"""
+    ModelSpace = object()
+    Name = "test.dwg"
+
+class _FakeDocuments:
+    """Stand-in for the AutoCAD Documents collection"""
+    Count = 1
+
+class _FakeApp:
+    """Stand-in for the AutoCAD.Application COM object"""
+    Name = "AutoCAD"
+    ActiveDocument = _FakeDoc()
+    Documents = _FakeDocuments()
+
+@contextmanager
+def _swap_attr(obj, name, value):
+    """Temporarily replace an attribute, restoring the original on exit"""
+    original = getattr(obj, name)
+    setattr(obj, name, value)
+    try:
+        yield
+    finally:
+        setattr(obj, name, original)
+
 def test_parsing_prompt():
     """Test the parsing prompt creation"""
     print("Testing parsing prompt creation...")
@@ -174,25 +200,18 @@ def test_summary_generation():
     
     return True
 
-@patch('autodraw_ai_agent.openai')
-@patch('autodraw_ai_agent.win32com.client')
-def test_mock_agent_initialization(mock_win32com, mock_openai):
-    """Test agent initialization with mocked dependencies"""
+def test_mock_agent_initialization():
+    """Test agent initialization with faked dependencies"""
     print("\nTesting agent initialization (mocked)...")
     
-    # Mock OpenAI
-    mock_openai.api_key = "test_key"
-    
-    # Mock AutoCAD
-    mock_autocad = Mock()
-    mock_doc = Mock()
-    mock_modelspace = Mock()
-    mock_autocad.ActiveDocument = mock_doc
-    mock_doc.ModelSpace = mock_modelspace
-    mock_win32com.client.Dispatch.return_value = mock_autocad
+    # Fake AutoCAD; the OpenAI client makes no network calls until used
+    com_client = autodraw_ai_agent.win32com.client
+    fake_connect = lambda _: _FakeApp()
     
     try:
-        agent = AutoDrawAIAgent(openai_api_key="test_key")
+        with _swap_attr(com_client, 'GetActiveObject', fake_connect), \
+             _swap_attr(com_client, 'Dispatch', fake_connect):
+            agent = AutoDrawAIAgent(openai_api_key="test_key")
         print("✅ Agent initialized successfully with mocked dependencies")
         
         # Test command map
@@ -215,11 +234,12 @@ def test_batch_file_parsing():
     
     # Read the example batch file
     try:
-        with open('batch_example.txt', 'r') as f:
+        batch_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'batch_example.txt')
+        with open(batch_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
         # Parse as text file with one request per line
-        requests = [line.strip() for line in content.split('\n') if line.strip()]
+        requests = [s for line in content.splitlines() if (s := line.strip())]
         
         print(f"✅ Batch file loaded: {len(requests)} requests")
         
@@ -242,6 +262,449 @@ def test_batch_file_parsing():
         print(f"❌ Error reading batch file: {e}")
         return False
 
+def test_fast_path_patterns():
+    """Test which requests the regex fast path parses without the model"""
+    print("\nTesting fast-path request patterns...")
+    
+    fast = autodraw_ai_agent._fast_path_specification
+    
+    # Simple requests are parsed directly
+    circle = fast("draw a circle at 0,0 with radius 5")
+    assert circle == {
+        "command": "circle",
+        "dimensions": {"radius": 5.0},
+        "position": {"center_point": [0.0, 0.0, 0.0]}
+    }
+    assert fast("Circle at (1.5, -2) radius of 3")["dimensions"]["radius"] == 3.0
+    rectangle = fast("Create a rectangle from (0,0) to (10, 5)")
+    assert rectangle == {
+        "command": "rectangle",
+        "position": {"start_point": [0.0, 0.0, 0.0], "end_point": [10.0, 5.0, 0.0]}
+    }
+    print("✅ Simple circle and rectangle requests take the fast path")
+    
+    # Anything beyond filler words must go to the model
+    for request in [
+        "draw a circle on layer WALLS in red at 0,0 with radius 5",
+        "draw a circle at 0,0 then a line to 9,9 with radius 5",
+        "draw a circle at 0,0 with radius 5 on layer WALLS",
+        "draw a rectangle rotated 45 degrees with fillet 2 from 0,0 to 10,10",
+        "draw a rectangle from 0,0 to 10,10 and a circle",
+    ]:
+        assert fast(request) is None, request
+    print("✅ Requests with extra detail fall through to the model")
+    
+    return True
+
+def test_recent_object_tracking():
+    """Test that remembered entities are only reused while still valid"""
+    print("\nTesting recent object tracking...")
+    
+    class Entity:
+        def __init__(self, owner):
+            self.owner = owner
+        @property
+        def OwnerID(self):
+            if self.owner is None:
+                raise autodraw_ai_agent.pywintypes.com_error(-2145386420, "Object was erased", None, None)
+            return self.owner
+    
+    class ModelSpace:
+        # No ObjectID: the cached model space id must be used instead
+        Count = 3
+        def Item(self, index):
+            return ("from model space", index)
+    
+    agent = AutoDrawAIAgent.__new__(AutoDrawAIAgent)
+    agent._thread_local = autodraw_ai_agent.threading.local()
+    agent._thread_local.modelspace_id = 42
+    modelspace = ModelSpace()
+    
+    # Nothing remembered yet: model space lookup
+    assert agent._recent_object(modelspace) == ("from model space", 2)
+    
+    # Entities this agent created are served directly, newest first
+    first, second = Entity(42), Entity(42)
+    agent._remember_object(first)
+    agent._remember_object(second)
+    assert agent._recent_object(modelspace) is second
+    assert agent._recent_object(modelspace, 2) is first
+    assert agent._recent_object_count() == 2
+    print("✅ Remembered entities are reused")
+    
+    # An entity from another drawing is not trusted
+    agent._remember_object(Entity(7))
+    assert agent._recent_object(modelspace) == ("from model space", 2)
+    assert len(agent._thread_local.recent_objects) == 0
+    
+    # Nor is an erased one
+    agent._remember_object(Entity(None))
+    assert agent._recent_object(modelspace) == ("from model space", 2)
+    print("✅ Stale entities fall back to model space")
+    
+    return True
+
+def test_qa_lisp_cache_per_document():
+    """Test that LISP loads are tracked per open document, not per drawing name"""
+    print("\nTesting per-document LISP load tracking...")
+    import tempfile
+    import autodraw_ai_agent_QA
+    
+    class Document:
+        Name = "Drawing1.dwg"
+        def __init__(self):
+            self.variables = {}
+            self.reads = 0
+        def GetVariable(self, name):
+            self.reads += 1
+            return self.variables.get(name, "")
+        def SetVariable(self, name, value):
+            self.variables[name] = value
+    
+    agent = autodraw_ai_agent_QA.AutoDrawAIAgent(initialize_autocad=False)
+    sent = []
+    agent._send_command = lambda doc, cmd: sent.append((doc, cmd))
+    
+    with tempfile.NamedTemporaryFile(suffix=".lsp", delete=False) as f:
+        lisp_path = f.name
+    try:
+        agent.set_lisp_path("universal", lisp_path)
+        first, second = Document(), Document()
+        
+        assert agent._load_lisp_file("universal", first)
+        assert agent._load_lisp_file("universal", first)
+        assert len(sent) == 1
+        assert first.reads == 1
+        print("✅ LISP is loaded once per document, reading its token once")
+        
+        # A second document with the same name still needs its own load
+        assert agent._load_lisp_file("universal", second)
+        assert len(sent) == 2 and sent[1][0] is second
+        assert agent._load_lisp_file("universal", first)
+        assert len(sent) == 2 and first.reads == 2
+        print("✅ Same-named documents are tracked separately")
+    finally:
+        os.remove(lisp_path)
+    
+    return True
+
+
+def test_qa_wait_for_autocad():
+    """Test that waiting rides out busy AutoCAD and stops when it disconnects"""
+    print("\nTesting waiting for AutoCAD commands...")
+    import autodraw_ai_agent_QA
+    com_error = autodraw_ai_agent_QA.pywintypes.com_error
+    
+    class Document:
+        def __init__(self, *replies):
+            self.replies = list(replies)
+        def GetVariable(self, name):
+            reply = self.replies.pop(0)
+            if isinstance(reply, Exception):
+                raise reply
+            return reply
+    
+    agent = autodraw_ai_agent_QA.AutoDrawAIAgent(initialize_autocad=False)
+    
+    # RPC_E_CALL_REJECTED, however many times in a row, means keep waiting
+    rejected = com_error(-2147418111, "Call was rejected by callee.", None, None)
+    assert agent._wait_for_autocad(Document(*[rejected] * 8, 1, 0))
+    print("✅ Busy AutoCAD is waited for")
+    
+    # RPC_S_SERVER_UNAVAILABLE means AutoCAD is gone
+    unavailable = com_error(-2147023174, "The RPC server is unavailable.", None, None)
+    try:
+        agent._wait_for_autocad(Document(unavailable))
+        assert False, "disconnect was not raised"
+    except com_error:
+        pass
+    print("✅ A disconnected AutoCAD is reported")
+    
+    return True
+
+
+def test_cli_batch_size():
+    """Test that the CLI only accepts a batch size of at least 1"""
+    print("\nTesting CLI batch size validation...")
+    import io
+    from cli_autodraw import AutoDrawCLI
+    
+    def parse(*argv):
+        with _swap_attr(sys, 'argv', ['cli_autodraw.py', *argv]):
+            return AutoDrawCLI().parse_arguments()
+    
+    assert parse('--batch-file', 'requests.txt').batch_size == 10
+    assert parse('--batch-file', 'requests.txt', '--batch-size', '1').batch_size == 1
+    print("✅ Positive batch sizes are accepted")
+    
+    for bad in ('0', '-3', 'ten'):
+        try:
+            with _swap_attr(sys, 'stderr', io.StringIO()):
+                parse('--batch-file', 'requests.txt', '--batch-size', bad)
+            assert False, f"--batch-size {bad} was accepted"
+        except SystemExit as e:
+            assert e.code == 2
+    print("✅ Zero, negative and non-numeric batch sizes are rejected")
+    
+    return True
+
+
+def test_qa2_setup_cached_after_send():
+    """Test that drawing setup is only cached once AutoCAD has run it"""
+    print("\nTesting drawing setup caching...")
+    import autodraw_ai_agent_QA_2
+    
+    class Document:
+        Name = "Drawing1.dwg"
+        def __init__(self):
+            self.sent = []
+        def GetVariable(self, name):
+            return ""
+        def SendCommand(self, cmd):
+            self.sent.append(cmd)
+    
+    agent = autodraw_ai_agent_QA_2.AutoDrawAIAgent(initialize_autocad=False)
+    doc = Document()
+    finished = [False]
+    agent._get_autocad_objects = lambda: (None, doc, None)
+    agent._wait_for_autocad = lambda doc: finished[0]
+    specs = {"series": "PG", "mounting": "Pendant", "output": "Standard",
+             "regress": 0, "length_ft": 4}
+    
+    # A failed send leaves nothing cached, so the next send includes setup again
+    assert agent.draw_fixtures_batch([("PG", specs)]) == [{"success": False}]
+    assert not agent._initialized_drawings and not agent._loaded_lisp
+    finished[0] = True
+    assert agent.draw_fixtures_batch([("PG", specs)]) == [{"success": True}]
+    assert "(setq ApiMode T)" in doc.sent[1]
+    print("✅ Setup is resent after a failed send")
+    
+    assert agent._initialized_drawings == {"Drawing1.dwg"}
+    assert agent._loaded_lisp == {("Drawing1.dwg", "PG")}
+    assert agent.draw_fixtures_batch([("PG", specs)]) == [{"success": True}]
+    assert doc.sent[2].startswith("(c:PGAutoAPI ")
+    print("✅ Setup is skipped once it has run")
+    
+    return True
+
+
+def test_multi_request_matching():
+    """Test that batched parse results are matched to requests by index"""
+    print("\nTesting multi-request result matching...")
+    from types import SimpleNamespace
+    
+    replies = []
+    def create(**kwargs):
+        content = json.dumps(replies.pop(0))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+    
+    agent = AutoDrawAIAgent.__new__(AutoDrawAIAgent)
+    agent.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    agent._create_multi_parsing_prompt = lambda chunk: "\n".join(chunk)
+    agent.process_natural_language_request = lambda text: {"single": text}
+    
+    # Indexes win over reply order; a missing index falls back to position
+    replies.append({"results": [{"index": 2, "name": "b"}, {"index": 1, "name": "a"}, {"name": "c"}]})
+    assert agent.process_natural_language_requests(["a", "b", "c"]) == [
+        {"name": "a"}, {"name": "b"}, {"name": "c"}]
+    print("✅ Results are matched by index, then position")
+    
+    # Dropped, duplicate and out-of-range entries leave requests to be parsed singly
+    replies.append({"results": [{"index": 1, "name": "a"}, {"index": 1, "name": "dup"}, {"index": 9}]})
+    assert agent.process_natural_language_requests(["a", "b", "c"]) == [
+        {"name": "a"}, {"single": "b"}, {"single": "c"}]
+    
+    # Groups follow batch_size, and a group of one is parsed on its own
+    replies.append({"results": [{"index": 1, "name": "a"}, {"index": 2, "name": "b"}]})
+    assert agent.process_natural_language_requests(["a", "b", "c"], batch_size=2) == [
+        {"name": "a"}, {"name": "b"}, {"single": "c"}]
+    assert not replies
+    print("✅ Unmatched requests are parsed one at a time")
+    
+    return True
+
+
+def test_cli_build_specifications():
+    """Test building specifications from CLI arguments"""
+    print("\nTesting CLI specification building...")
+    from cli_autodraw import AutoDrawCLI
+    
+    cli = AutoDrawCLI()
+    def build(*argv):
+        with _swap_attr(sys, 'argv', ['cli_autodraw.py', *argv]):
+            return cli.build_specifications(cli.parse_arguments())
+    
+    specs = build('--system', 'ls', '--length', '8', '--start', '0,0', '--end', '8,0',
+                  '--wattage', '40', '--mounting', 'wall_mount', '--closed', '--rows', '2')
+    assert specs == {
+        "command": config.LIGHTING_SYSTEMS['ls']['command'],
+        "lighting_system": "ls",
+        "dimensions": {"length": 8.0},
+        "position": {"start_point": [0.0, 0.0, 0], "end_point": [8.0, 0.0, 0],
+                     "orientation": "horizontal"},
+        "specifications": {"wattage": 40, "mounting_type": "wall_mount", "quantity": 1},
+        "additional_parameters": {"closed": "true", "rows": 2},
+    }, specs
+    assert build('--command', 'polyline', '--points', '0,0;5,0;5,5')["position"]["points"] == [
+        [0.0, 0.0, 0], [5.0, 0.0, 0], [5.0, 5.0, 0]]
+    print("✅ Argument tables fill each specification section")
+    
+    # Bad coordinates reject the whole specification
+    assert build('--start', '0;0') is None
+    assert build('--points', '0,0;5') is None
+    print("✅ Invalid coordinates are rejected")
+    
+    return True
+
+
+def test_cli_parse_xy():
+    """Test parsing x,y coordinate arguments"""
+    print("\nTesting CLI coordinate parsing...")
+    from cli_autodraw import _parse_xy
+    
+    assert _parse_xy("1.5,-2") == [1.5, -2.0, 0]
+    assert _parse_xy(" 3 , 4 ") == [3.0, 4.0, 0]
+    for bad in ("3", "1,2,3", "x,1"):
+        try:
+            _parse_xy(bad)
+            assert False, f"{bad!r} was parsed"
+        except ValueError:
+            pass
+    print("✅ x,y arguments are parsed into points")
+    
+    return True
+
+
+def test_qa_fixture_type_normalization():
+    """Test that fixture types are normalized in any letter case"""
+    print("\nTesting QA fixture type normalization...")
+    from autodraw_ai_agent_QA import _NORMALIZE_FIXTURE_TYPE, _FIXTURE_TYPES
+    
+    for spelling, name in (("pg", "PG"), ("Pg", "PG"), ("PG", "PG"),
+                           ("ls", "LS"), ("lS", "LS"), ("lsr", "LSR"), ("LsR", "LSR")):
+        assert _NORMALIZE_FIXTURE_TYPE[spelling] == name, spelling
+    assert len(_NORMALIZE_FIXTURE_TYPE) == 4 + 4 + 8
+    assert set(_NORMALIZE_FIXTURE_TYPE.values()) <= _FIXTURE_TYPES
+    print("✅ PG, LS and LSR are matched in any letter case")
+    
+    # Other types are passed through as written
+    for fixture_type in ("Rush", "Rush-Rec", "MagTrk", "rush"):
+        assert fixture_type not in _NORMALIZE_FIXTURE_TYPE
+    print("✅ Other fixture types are left alone")
+    
+    return True
+
+def test_qa_finish_mapping():
+    """Test mapping finish spellings to LISP finish names"""
+    print("\nTesting QA finish mapping...")
+    import autodraw_ai_agent_QA
+    from autodraw_ai_agent_QA import FINISH_MAP, _FINISH_LOOKUP
+    
+    # Common spellings are looked up directly
+    for spelling, finish in (("WH", "White"), ("wh", "White"), ("Wh", "White"), ("White", "White"),
+                             ("blk", "Black"), ("Silver", "Silver"), ("custom", "CC"), ("CC", "CC")):
+        assert _FINISH_LOOKUP[spelling] == finish, spelling
+    for code, finish in FINISH_MAP.items():
+        assert _FINISH_LOOKUP[code] == finish
+    print("✅ Upper, lower and title case spellings are in the lookup")
+    
+    agent = autodraw_ai_agent_QA.AutoDrawAIAgent(initialize_autocad=False)
+    assert agent._map_finish("bLk") == "Black"
+    assert agent._map_finish("SiLvEr") == "Silver"
+    assert agent._map_finish(None) == "White"
+    assert agent._map_finish("Bronze") == "White"
+    print("✅ Other spellings fall back to case folding, then White")
+    
+    return True
+
+def test_qa_pg_command_rendering():
+    """Test rendering the PG LISP command from fixture specs"""
+    print("\nTesting QA PG command rendering...")
+    import autodraw_ai_agent_QA
+    
+    agent = autodraw_ai_agent_QA.AutoDrawAIAgent(initialize_autocad=False)
+    build = lambda specs: agent._build_pg_lisp_command(agent._map_pg_params(specs))
+    specs = {"series": "PG4", "mounting": "Pendant", "output": "Standard",
+             "regress": "1", "length_ft": 8}
+    
+    # Optional fields take their defaults; None becomes nil
+    assert build(specs) == (
+        '(c:PGAutoAPI "PG4" "Pendant" "Standard" 1 8.0 0.0 '
+        '0 0 nil "White" "Exact" "EqualLength" '
+        '0 nil "F1" 1 "" '
+        '"" 0.0 0.0)\n'
+    )
+    print("✅ Defaults render as LISP literals")
+    
+    assert build({**specs, "length_in": 6, "flush_ceiling": True, "custom_output": 450,
+                  "finish": "blk", "breakdown": "MaxSection", "max_section": 12,
+                  "fixture_num": "F7", "quantity": 3, "fixture_type": "A",
+                  "run_id": "R1", "start_x": 10, "start_y": -5}) == (
+        '(c:PGAutoAPI "PG4" "Pendant" "Standard" 1 8.0 6.0 '
+        '1 0 450 "Black" "Exact" "MaxSection" '
+        '1 12 "F7" 3 "A" '
+        '"R1" 10.0 -5.0)\n'
+    )
+    print("✅ Every template field is filled")
+    
+    return True
+
+def test_batch_iter_mixed_requests():
+    """Test that batches mixing text and specifications dicts are drawn in order"""
+    print("\nTesting batch processing of mixed requests...")
+    
+    agent = AutoDrawAIAgent.__new__(AutoDrawAIAgent)
+    agent._thread_local = autodraw_ai_agent.threading.local()
+    agent.process_natural_language_request = lambda text: {"parsed": text}
+    agent.create_complete_drawing = lambda specs: {"success": True, "specs": specs}
+    agent._wait_for_command_completion = lambda: None
+    
+    results = list(agent.batch_process_requests_iter([{"command": "circle"}, "draw a circle"]))
+    assert results == [{"success": True, "specs": {"command": "circle"}},
+                       {"success": True, "specs": {"parsed": "draw a circle"}}]
+    print("✅ Specifications dicts are drawn without parsing")
+    
+    # Whitespace variants are parsed once, from the text as first written
+    parsed = []
+    agent.process_natural_language_request = lambda text: parsed.append(text) or {"parsed": text}
+    results = list(agent.batch_process_requests_iter(["draw  a circle\n", "draw a circle"]))
+    assert parsed == ["draw  a circle\n"]
+    assert results == [{"success": True, "specs": {"parsed": "draw  a circle\n"}}] * 2
+    print("✅ Repeated prompts are parsed once from the original text")
+    
+    # A failing producer ends the batch with errors instead of hanging it
+    class Request(str):
+        def split(self):
+            raise RuntimeError("producer failed")
+    results = list(agent.batch_process_requests_iter(["draw a circle", Request("draw a line")]))
+    assert results == [{"success": False, "error": "producer failed"}] * 2
+    print("✅ Producer failures are reported for the remaining requests")
+    
+    return True
+
+def test_transform_value_validation():
+    """Test that rotate and scale only send numeric values to AutoCAD"""
+    print("\nTesting rotate/scale value validation...")
+    
+    agent = AutoDrawAIAgent.__new__(AutoDrawAIAgent)
+    sent = []
+    agent._send_transform_command = sent.append
+    position = {"base_point": [1, 2]}
+    
+    assert agent._rotate_objects({"position": position, "angle": "45"}, None)
+    assert agent._scale_objects({"position": position, "scale_factor": 3}, None)
+    assert sent[0].endswith("\n1.0,2.0,0.0\n45.0\n")
+    assert sent[1].endswith("\n1.0,2.0,0.0\n3.0\n")
+    print("✅ Numeric values are sent")
+    
+    for bad in (None, "ninety", "45\n_.ERASE"):
+        assert not agent._rotate_objects({"position": position, "angle": bad}, None)
+        assert not agent._scale_objects({"position": position, "scale_factor": bad}, None)
+    assert len(sent) == 2
+    print("✅ Bad values fail before anything is sent")
+    
+    return True
+
 def run_all_tests():
     """Run all tests"""
     print("🧪 Running AutoDraw AI Agent Tests")
@@ -254,7 +717,21 @@ def run_all_tests():
         ("Command Parameter Preparation", test_command_parameter_preparation),
         ("Summary Generation", test_summary_generation),
         ("Mock Agent Initialization", test_mock_agent_initialization),
-        ("Batch File Parsing", test_batch_file_parsing)
+        ("Batch File Parsing", test_batch_file_parsing),
+        ("Fast Path Patterns", test_fast_path_patterns),
+        ("Recent Object Tracking", test_recent_object_tracking),
+        ("QA LISP Cache Per Document", test_qa_lisp_cache_per_document),
+        ("QA Wait For AutoCAD", test_qa_wait_for_autocad),
+        ("CLI Batch Size", test_cli_batch_size),
+        ("QA2 Setup Cached After Send", test_qa2_setup_cached_after_send),
+        ("Multi-Request Matching", test_multi_request_matching),
+        ("CLI Specification Building", test_cli_build_specifications),
+        ("CLI Coordinate Parsing", test_cli_parse_xy),
+        ("QA Fixture Type Normalization", test_qa_fixture_type_normalization),
+        ("QA Finish Mapping", test_qa_finish_mapping),
+        ("QA PG Command Rendering", test_qa_pg_command_rendering),
+        ("Batch Mixed Requests", test_batch_iter_mixed_requests),
+        ("Transform Value Validation", test_transform_value_validation)
     ]
     
     passed = 0